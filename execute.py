@@ -28,24 +28,28 @@ Usage examples:
     # Individual operations
     python execute.py compile workbench/profiles/my-profile
     python execute.py deploy workbench/profiles/my-profile
+    
+    # Machine-readable output (JSON events on stdout, tool output on stderr)
+    python execute.py --json yaml workbench/my-profile.yaml -f
 """
 
 import argparse
+import contextlib
+import functools
+import io
+import json
+import os
 import sys
-import traceback
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Optional
+from typing import Tuple
 
 # Add tools directory to path
 sys.path.insert(0, str(Path(__file__).parent / 'tools'))
 
-# Import tool functions
-from generate import YAMLToProfileConverter
-from compile import compile as compile_profiles
-from deploy import deploy as deploy_profiles
-from backup import backup_sd_card, restore_sd_card
-from device import DuckyPadDevice
-from shared.console import print_color as _print_color
+# Tool modules (YAML, HID, ...) are imported inside each cmd_* function so a
+# command only loads what it uses, and --help loads none of them
+from shared.console import colorize, print_color as _print_color
 
 
 class Colors:
@@ -58,39 +62,148 @@ class Colors:
     RESET = "\033[0m"
 
 
+# Colors code -> shared.console color name
+_COLOR_NAMES = {
+    Colors.RED: "red",
+    Colors.GREEN: "green",
+    Colors.YELLOW: "yellow",
+    Colors.BLUE: "blue",
+    Colors.CYAN: "cyan",
+}
+
+
+# Colors code -> --json event name
+_EVENT_NAMES = {
+    Colors.RED: "error",
+    Colors.YELLOW: "warning",
+    Colors.GREEN: "success",
+}
+
+# Status marks dropped from the start of --json event messages
+_STATUS_MARKS = ("✗ ", "✓ ")
+
+_BAR = "=" * 60
+
+# Set by --json to the real stdout: launcher output becomes one JSON event per
+# line there, and tool output is redirected to stderr
+_json_stream = None
+
+
+def emit_event(event: str, **fields):
+    """Write a JSON event line (only in --json mode)"""
+    if _json_stream is not None:
+        _json_stream.write(json.dumps({"event": event, **fields}) + "\n")
+
+
 def print_color(message: str, color: str):
-    """Print colored message"""
-    _print_color(message, color.replace("\033[", "").replace("m", "").replace("91", "red").replace("92", "green").replace("93", "yellow").replace("94", "blue").replace("96", "cyan"))
+    """Print colored message (in --json mode, emit it as an error, warning,
+    success or info event instead)
+    """
+    if _json_stream is not None:
+        text = message.lstrip("\n")  # Leading blank lines are only layout
+        if text.startswith(_STATUS_MARKS):
+            text = text[len(_STATUS_MARKS[0]):]
+        emit_event(_EVENT_NAMES.get(color, "info"), message=text)
+        return
+    _print_color(message, _COLOR_NAMES.get(color, "white"))
 
 
 def print_header(message: str):
-    """Print section header"""
-    print()
-    print("=" * 60)
-    _print_color(message, "cyan")
-    print("=" * 60)
+    """Print section header (nothing in --json mode)"""
+    if _json_stream is None:
+        sys.stdout.write(f"\n{_BAR}\n{colorize(message, 'cyan')}\n{_BAR}\n")
+
+
+@contextlib.contextmanager
+def _block_buffered_stdout():
+    """Turn off stdout line buffering (per-line flushes to a terminal) for a
+    phase that prints many lines without waiting on the user, then flush
+    """
+    stream = sys.stdout
+    line_buffering = getattr(stream, "line_buffering", False)
+    if line_buffering:
+        stream.reconfigure(line_buffering=False)
+    try:
+        yield
+    finally:
+        stream.flush()
+        if line_buffering:
+            stream.reconfigure(line_buffering=True)
+
+
+def _compile_captured(profile_path: Path, verbose: bool, resolve_profiles: bool) -> Tuple[int, str]:
+    """Compile one profile in a worker process, capturing its console output
+    
+    Args:
+        profile_path: Profile directory to compile
+        verbose: Enable verbose output
+        resolve_profiles: Enable GOTO_PROFILE name resolution
+        
+    Returns:
+        Tuple of (exit code, captured output)
+    """
+    from compile import compile as compile_profiles
+    
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        exit_code = compile_profiles(
+            profile_path=profile_path,
+            verbose=verbose,
+            resolve_profiles=resolve_profiles,
+            prune_cache=False  # cmd_yaml prunes once before starting the workers
+        )
+    return exit_code, output.getvalue()
 
 
 def cmd_yaml(args):
     """Generate profiles from YAML, compile, and optionally deploy"""
+    from generate import YAMLToProfileConverter
+    from compile import DuckyScriptCompiler
+    from deploy import deploy as deploy_profiles
+    
     yaml_path = args.yaml_file
     
-    if not yaml_path.exists():
+    # Read the template once here; the converter parses these bytes instead of
+    # checking for and opening the file again
+    try:
+        yaml_bytes = yaml_path.read_bytes()
+    except FileNotFoundError:
         print_color(f"✗ YAML file not found: {yaml_path}", Colors.RED)
         return 1
+    except OSError as e:
+        print_color(f"✗ Could not read YAML file {yaml_path}: {e}", Colors.RED)
+        return 1
+    
+    # Make sure the compiler is present before any compile starts, so parallel
+    # workers never race to download it
+    compile_step = not args.generate_only
+    if compile_step:
+        compiler = DuckyScriptCompiler(verbose=args.verbose, resolve_profiles=False)
+        if not compiler.compiler_path.exists() and not compiler.get_latest_compiler():
+            print_color("✗ Failed to fetch compiler", Colors.RED)
+            return 1
+        compiler.prune_compile_cache()  # Once here, not in every worker
     
     # Step 1: Generate profiles from YAML
     print_header(f"Step 1: Generating profiles from '{yaml_path.name}'")
+    profile_paths = []
     try:
-        converter = YAMLToProfileConverter(yaml_path, verbose=args.verbose)
-        profile_paths = converter.convert()
-        
-        print_color(f"✓ Generated {len(profile_paths)} profile(s):", Colors.GREEN)
-        for path in profile_paths:
+        converter = YAMLToProfileConverter(
+            yaml_path,
+            verbose=args.verbose,
+            preloaded_bytes=yaml_bytes,
+            write_readme=not args.no_readme
+        )
+        for path in converter.iter_profiles():
+            profile_paths.append(path)
             print_color(f"  • {path}", Colors.CYAN)
+        
+        emit_event("generate", count=len(profile_paths), profiles=[str(path) for path in profile_paths])
+        print_color(f"✓ Generated {len(profile_paths)} profile(s)", Colors.GREEN)
     except Exception as e:
         print_color(f"✗ Generation failed: {e}", Colors.RED)
         if args.verbose:
+            import traceback
             traceback.print_exc()
         return 1
     
@@ -98,20 +211,32 @@ def cmd_yaml(args):
         print_color("\n✓ Generation complete (--generate-only flag set)", Colors.GREEN)
         return 0
     
-    # Step 2: Compile all generated profiles
+    # Step 2: Compile on worker processes, created only now that the generator
+    # threads have exited (forking while they run can deadlock the workers).
+    # Output is buffered per profile and printed in order, stopping at the
+    # first failure like a sequential loop
     print_header(f"Step 2: Compiling {len(profile_paths)} profile(s)")
     
-    for profile_path in profile_paths:
-        print_color(f"\nCompiling: {profile_path.name}", Colors.CYAN)
-        exit_code = compile_profiles(
-            profile_path=profile_path,
-            verbose=args.verbose,
-            resolve_profiles=not args.no_resolve_profiles
-        )
-        
-        if exit_code != 0:
-            print_color(f"\n✗ Compilation failed for {profile_path.name}", Colors.RED)
-            return exit_code
+    if profile_paths:
+        workers = min(len(profile_paths), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers) as executor, _block_buffered_stdout():
+            futures = [
+                executor.submit(_compile_captured, path, args.verbose, not args.no_resolve_profiles)
+                for path in profile_paths
+            ]
+            for profile_path, future in zip(profile_paths, futures):
+                exit_code, output = future.result()
+                print_color(f"\nCompiling: {profile_path.name}", Colors.CYAN)
+                sys.stdout.write(output)
+                sys.stdout.flush()  # One flush per profile keeps progress visible
+                emit_event("compile", profile=profile_path.name, exit_code=exit_code)
+                
+                if exit_code != 0:
+                    # Drop the compiles that have not started yet
+                    for pending in futures:
+                        pending.cancel()
+                    print_color(f"\n✗ Compilation failed for {profile_path.name}", Colors.RED)
+                    return exit_code
     
     if args.compile_only:
         print_color("\n✓ Compilation complete (--compile-only flag set)", Colors.GREEN)
@@ -128,6 +253,7 @@ def cmd_yaml(args):
             force=args.force,
             auto_unmount=True  # Always unmount in YAML workflow
         )
+        emit_event("deploy", count=len(profile_paths), exit_code=exit_code)
         
         if exit_code != 0:
             print_color("\n✗ Deployment failed", Colors.RED)
@@ -140,34 +266,41 @@ def cmd_yaml(args):
 
 def cmd_backup(args):
     """Create backup of SD card"""
+    from backup import backup_sd_card
+    
     print_header("Backing up SD card")
-    return backup_sd_card(
+    backup_path = backup_sd_card(
         backup_path=args.backup_path,
         verbose=args.verbose
     )
+    return 0 if backup_path else 1
 
 
 def cmd_restore(args):
     """Restore SD card from backup"""
+    from backup import restore_sd_card
+    
     print_header("Restoring SD card")
-    return restore_sd_card(
+    restored = restore_sd_card(
         backup_path=args.backup_path,
         verbose=args.verbose,
         force=args.force
     )
+    return 0 if restored else 1
 
 
 def cmd_device(args):
     """Control duckyPad device"""
+    from device import DuckyPadDevice
+    
     # For scan, always show output; for mount/unmount, only if verbose
     verbose = args.verbose if hasattr(args, 'verbose') else False
-    show_scan_output = True  # Always show scan results
     
-    device = DuckyPadDevice(verbose=verbose)
+    # One controller serves every branch (scan is always verbose)
+    device = DuckyPadDevice(verbose=verbose or args.device_command == "scan")
     
     if args.device_command == "scan":
-        device_verbose = DuckyPadDevice(verbose=True)  # Always verbose for scan
-        devices = device_verbose.scan_devices()
+        devices = device.scan_devices()
         if not devices:
             print_color("No duckyPad devices found", Colors.YELLOW)
             return 1
@@ -190,6 +323,8 @@ def cmd_device(args):
 
 def cmd_compile(args):
     """Compile existing profiles"""
+    from compile import compile as compile_profiles
+    
     print_header("Compiling profiles")
     return compile_profiles(
         profile_path=args.profile_path,
@@ -200,6 +335,8 @@ def cmd_compile(args):
 
 def cmd_deploy(args):
     """Deploy existing profiles"""
+    from deploy import deploy as deploy_profiles
+    
     print_header("Deploying profiles")
     return deploy_profiles(
         source_profiles=args.profiles,
@@ -209,32 +346,46 @@ def cmd_deploy(args):
     )
 
 
-def main():
-    """Main menu / launcher entry point"""
+@functools.lru_cache(maxsize=1)
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the launcher's argument parser (once per process)
+    
+    Cached so repeated in-process main() calls (test harnesses, wrappers) reuse
+    it; parse_args() returns a fresh Namespace each time.
+    
+    Returns:
+        Parser with one subparser per command (each sets its cmd_* as func)
+    """
     parser = argparse.ArgumentParser(
         description="duckyPad Pro - Main Menu / Launcher for all tools",
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""
 Examples:
   # YAML Workflow
-  python duckypad.py yaml workbench/layer_type_test.yaml -f
-  python duckypad.py yaml workbench/my-profile.yaml --generate-only
+  python execute.py yaml workbench/layer_type_test.yaml -f
+  python execute.py yaml workbench/my-profile.yaml --generate-only
   
   # Device Control
-  python duckypad.py device scan
-  python duckypad.py device mount -v
-  python duckypad.py device unmount -v
+  python execute.py device scan
+  python execute.py device mount -v
+  python execute.py device unmount -v
   
   # Backup & Restore
-  python duckypad.py backup -v
-  python duckypad.py restore -v
+  python execute.py backup -v
+  python execute.py restore -v
   
   # Individual Operations
-  python duckypad.py compile workbench/profiles/my-profile -v
-  python duckypad.py deploy workbench/profiles/profile1 profile2 -f
+  python execute.py compile workbench/profiles/my-profile -v
+  python execute.py deploy workbench/profiles/profile1 profile2 -f
         """
     )
     
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Machine-readable output: one JSON event per line on stdout (tool output goes to stderr)"
+    )
+    
     subparsers = parser.add_subparsers(dest="command", help="Command to run")
     
     # 'yaml' command - YAML workflow
@@ -244,6 +395,7 @@ Examples:
     yaml_parser.add_argument("--compile-only", action="store_true", help="Generate and compile, skip deploy")
     yaml_parser.add_argument("--skip-deploy", action="store_true", help="Skip deployment step")
     yaml_parser.add_argument("--no-resolve-profiles", action="store_true", help="Disable GOTO_PROFILE name resolution")
+    yaml_parser.add_argument("--no-readme", action="store_true", help="Don't generate README.md in profile folders")
     yaml_parser.add_argument("-b", "--backup-path", type=Path, help="Custom backup location")
     yaml_parser.add_argument("-v", "--verbose", action="store_true", help="Verbose output")
     yaml_parser.add_argument("-f", "--force", action="store_true", help="Skip confirmation prompts")
@@ -292,12 +444,44 @@ Examples:
     
     device_parser.set_defaults(func=cmd_device)
     
+    return parser
+
+
+def main():
+    """Main menu / launcher entry point"""
+    # Fast paths that skip building the full parser (anything else, including
+    # --help, goes to argparse)
+    argv = sys.argv[1:]
+    
+    # No command: the module docstring already is a usage summary
+    if not argv:
+        sys.stdout.write(__doc__.lstrip("\n"))
+        return 1
+    
+    # Plain "device scan|mount|unmount [-v]"
+    if (len(argv) >= 2 and argv[0] == "device" and argv[1] in ("scan", "mount", "unmount")
+            and all(arg in ("-v", "--verbose") for arg in argv[2:])):
+        return cmd_device(argparse.Namespace(
+            command="device",
+            device_command=argv[1],
+            verbose=len(argv) > 2
+        ))
+    
+    parser = _build_parser()
     args = parser.parse_args()
     
     if not args.command:
         parser.print_help()
         return 1
     
+    if args.json:
+        global _json_stream
+        _json_stream = sys.stdout
+        with contextlib.redirect_stdout(sys.stderr):
+            exit_code = args.func(args)
+        emit_event("exit", command=args.command, exit_code=exit_code)
+        return exit_code
+    
     # Run the selected command
     return args.func(args)
 
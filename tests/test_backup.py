@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Test SD card backups without an SD card
+
+Backs up a temporary directory twice and checks that files unchanged since
+the first backup are hard-linked from it (same inode) while changed files
+are copied, including same-size edits that keep the mtime.
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add tools directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'tools'))
+
+from backup import backup_sd_card, MANIFEST_NAME  # type: ignore
+from shared.console import print_color  # type: ignore
+
+
+def _make_sd_card(sd_root: Path):
+    """Create a small fake SD card layout"""
+    (sd_root / "profile_Alpha").mkdir(parents=True)
+    (sd_root / "profile_Beta").mkdir()
+    (sd_root / "profile_info.txt").write_text("1 Alpha\n2 Beta\n", encoding="utf-8")
+    (sd_root / "profile_Alpha" / "config.txt").write_text("z1 A\n", encoding="utf-8")
+    (sd_root / "profile_Alpha" / "key1.txt").write_text("STRING a\n", encoding="utf-8")
+    (sd_root / "profile_Alpha" / "key1.dsb").write_bytes(b"\x00\x01")
+    (sd_root / "profile_Beta" / "key1.txt").write_text("STRING b\n", encoding="utf-8")
+
+
+def test_incremental_backup():
+    """Test that a second backup hard-links unchanged files and copies changed ones"""
+    with tempfile.TemporaryDirectory() as tmp:
+        sd_root = Path(tmp) / "sd"
+        backup_root = Path(tmp) / "backups"
+        _make_sd_card(sd_root)
+        
+        first = backup_sd_card(sd_root, backup_root / "backup_20250101_000000", workers=2)
+        assert first is not None, "first backup failed"
+        assert (first / MANIFEST_NAME).is_file(), f"{MANIFEST_NAME} not written"
+        assert not (first / "profile_Alpha" / "key1.dsb").exists(), ".dsb file was backed up"
+        
+        # Change one file (new size, so its fingerprint differs)
+        (sd_root / "profile_Beta" / "key1.txt").write_text("STRING changed\n", encoding="utf-8")
+        
+        second = backup_sd_card(sd_root, backup_root / "backup_20250101_000001", workers=2)
+        assert second is not None, "second backup failed"
+        
+        for rel_path in ("profile_info.txt", "profile_Alpha/config.txt", "profile_Alpha/key1.txt"):
+            assert os.stat(first / rel_path).st_ino == os.stat(second / rel_path).st_ino, \
+                f"unchanged {rel_path} was not hard-linked"
+        
+        rel_path = "profile_Beta/key1.txt"
+        assert os.stat(first / rel_path).st_ino != os.stat(second / rel_path).st_ino, \
+            f"changed {rel_path} was hard-linked"
+        assert (second / rel_path).read_text(encoding="utf-8") == "STRING changed\n"
+        assert (first / rel_path).read_text(encoding="utf-8") == "STRING b\n", "previous backup was modified"
+
+
+def test_same_mtime_edit_is_copied():
+    """A same-size edit that keeps the mtime (FAT's 2-second resolution) is copied, not linked"""
+    with tempfile.TemporaryDirectory() as tmp:
+        sd_root = Path(tmp) / "sd"
+        backup_root = Path(tmp) / "backups"
+        _make_sd_card(sd_root)
+        
+        first = backup_sd_card(sd_root, backup_root / "backup_20250101_000000", workers=2)
+        assert first is not None, "first backup failed"
+        
+        # Rewrite a file just written (within the mtime window) without changing its size or mtime
+        key_path = sd_root / "profile_Alpha" / "key1.txt"
+        st = os.stat(key_path)
+        key_path.write_text("STRING z\n", encoding="utf-8")
+        os.utime(key_path, ns=(st.st_atime_ns, st.st_mtime_ns))
+        
+        second = backup_sd_card(sd_root, backup_root / "backup_20250101_000001", workers=2)
+        assert second is not None, "second backup failed"
+        
+        rel_path = "profile_Alpha/key1.txt"
+        assert os.stat(first / rel_path).st_ino != os.stat(second / rel_path).st_ino, \
+            f"edited {rel_path} was hard-linked"
+        assert (second / rel_path).read_text(encoding="utf-8") == "STRING z\n"
+        assert os.stat(first / "profile_info.txt").st_ino == os.stat(second / "profile_info.txt").st_ino, \
+            "unchanged profile_info.txt was not hard-linked"
+
+
+def main():
+    """Run all tests"""
+    print_color("=" * 60, "cyan")
+    print_color("Backup Tests", "cyan")
+    print_color("=" * 60, "cyan")
+    
+    tests = [
+        test_incremental_backup,
+        test_same_mtime_edit_is_copied,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print_color(f"  ✓ {test.__doc__}", "green")
+        except AssertionError as e:
+            print_color(f"  ✗ {test.__doc__}: {e}", "red")
+            failed += 1
+    
+    print_color("\n" + "=" * 60, "cyan")
+    print_color(f"Results: {len(tests) - failed} passed, {failed} failed", "white")
+    print_color("=" * 60, "cyan")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Test the compiled bytecode cache
+
+Uses a stand-in compiler script (copies its input and logs each call) and a
+temporary cache directory, so no real compiler or SD card is needed.
+"""
+
+import contextlib
+import sys
+import tempfile
+from pathlib import Path
+
+# Add tools directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'tools'))
+
+import compile as compile_module  # type: ignore
+from shared.console import print_color  # type: ignore
+
+
+# Stand-in for make_bytecode.py: "compiles" by copying the source, logging each call
+FAKE_COMPILER = """import sys
+from pathlib import Path
+src, dst = Path(sys.argv[1]), Path(sys.argv[2])
+dst.write_bytes(b"DSB:" + src.read_bytes())
+with open(Path(__file__).with_name("calls.log"), "a") as log:
+    log.write("x")
+"""
+
+
+@contextlib.contextmanager
+def _temp_compiler():
+    """Yield (tmp, compiler) using the stand-in script and a cache under tmp
+    
+    COMPILE_CACHE_DIR is restored afterwards, so other tests (and real
+    compiles in the same process) keep using the normal cache.
+    """
+    saved_cache_dir = compile_module.COMPILE_CACHE_DIR
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        compile_module.COMPILE_CACHE_DIR = tmp / "cache"
+        try:
+            compiler = compile_module.DuckyScriptCompiler(resolve_profiles=False)
+            compiler.compiler_path = tmp / "make_bytecode.py"
+            compiler.compiler_path.write_text(FAKE_COMPILER, encoding="utf-8")
+            yield tmp, compiler
+        finally:
+            compile_module.COMPILE_CACHE_DIR = saved_cache_dir
+
+
+def _compile_calls(tmp: Path) -> int:
+    """Number of times the stand-in compiler ran"""
+    log = tmp / "calls.log"
+    return len(log.read_text()) if log.exists() else 0
+
+
+def test_cache_miss_then_hit():
+    """A second compile of an identical script is served from the cache"""
+    with _temp_compiler() as (tmp, compiler):
+        (tmp / "a").mkdir()
+        (tmp / "b").mkdir()
+        first = tmp / "a" / "key1.txt"
+        second = tmp / "b" / "key1.txt"
+        first.write_text("STRING hello\n", encoding="utf-8")
+        second.write_text("STRING hello\n", encoding="utf-8")
+        
+        assert compiler.compile_file(first), "first compile failed"
+        assert _compile_calls(tmp) == 1, "compiler did not run on a cache miss"
+        
+        assert compiler.compile_file(second), "cached compile failed"
+        assert _compile_calls(tmp) == 1, "compiler ran again on a cache hit"
+        assert second.with_suffix(".dsb").read_bytes() == first.with_suffix(".dsb").read_bytes()
+
+
+def test_changed_script_misses():
+    """A changed script is compiled again"""
+    with _temp_compiler() as (tmp, compiler):
+        script = tmp / "key1.txt"
+        script.write_text("STRING one\n", encoding="utf-8")
+        assert compiler.compile_file(script)
+        
+        script.write_text("STRING two\n", encoding="utf-8")
+        assert compiler.compile_file(script)
+        assert _compile_calls(tmp) == 2, "changed script was served from the cache"
+        assert script.with_suffix(".dsb").read_bytes() == b"DSB:STRING two\n"
+
+
+def test_pruned_entry_recompiles():
+    """An entry removed from the cache falls back to a real compile"""
+    with _temp_compiler() as (tmp, compiler):
+        script = tmp / "key1.txt"
+        script.write_text("STRING hello\n", encoding="utf-8")
+        assert compiler.compile_file(script)
+        
+        for entry in compile_module.COMPILE_CACHE_DIR.iterdir():
+            entry.unlink()
+        assert compiler.compile_file(script), "compile failed after the cache entry vanished"
+        assert _compile_calls(tmp) == 2
+
+
+def main():
+    """Run all tests"""
+    print_color("=" * 60, "cyan")
+    print_color("Compile Cache Tests", "cyan")
+    print_color("=" * 60, "cyan")
+    
+    tests = [
+        test_cache_miss_then_hit,
+        test_changed_script_misses,
+        test_pruned_entry_recompiles,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print_color(f"  ✓ {test.__doc__}", "green")
+        except AssertionError as e:
+            print_color(f"  ✗ {test.__doc__}: {e}", "red")
+            failed += 1
+    
+    print_color("\n" + "=" * 60, "cyan")
+    print_color(f"Results: {len(tests) - failed} passed, {failed} failed", "white")
+    print_color("=" * 60, "cyan")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
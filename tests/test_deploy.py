@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Test profile_info.txt updates and single-profile deploys without an SD card
+
+Runs ProfileDeployer against a temporary directory laid out like an SD card
+root.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+# Add tools directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'tools'))
+
+from deploy import ProfileDeployer, _profile_unchanged  # type: ignore
+from shared.console import print_color  # type: ignore
+
+
+def _update(existing_info: str, dir_names) -> str:
+    """Run update_profile_info on a fake SD card and return the new profile_info.txt"""
+    with tempfile.TemporaryDirectory() as tmp:
+        sd_root = Path(tmp)
+        (sd_root / "profile_info.txt").write_text(existing_info, encoding="utf-8")
+        for dir_name in dir_names:
+            (sd_root / dir_name).mkdir()
+        
+        assert ProfileDeployer(force=True).update_profile_info(sd_root), "update_profile_info failed"
+        return (sd_root / "profile_info.txt").read_text(encoding="utf-8")
+
+
+def test_preserves_existing_entries():
+    """Existing entries keep their numbers and file order"""
+    info = _update("2 Beta\n1 Alpha\n", ["profile_Alpha", "profile_Beta"])
+    assert info == "2 Beta\n1 Alpha\n", repr(info)
+
+
+def test_drops_missing_and_appends_new():
+    """Entries without a directory are dropped; new profiles are appended after the highest number"""
+    info = _update("1 Alpha\n2 Gone\n3 Beta\n", ["profile_Beta", "profile_Alpha", "profile_Zed", "profile_New"])
+    assert info == "1 Alpha\n3 Beta\n4 New\n5 Zed\n", repr(info)
+
+
+def test_duplicate_entries():
+    """Duplicate names are listed once (first file entry, or first directory)"""
+    info = _update("1 Alpha\n2 Alpha\n", ["profile_Alpha", "profile_New", "profile7_New"])
+    assert info == "1 Alpha\n2 New\n", repr(info)
+
+
+def test_skips_staging_dirs():
+    """Interrupted-deploy staging directories are not listed"""
+    info = _update("1 Alpha\n", ["profile_Alpha", ".tmp-profile_Staged", ".old-profile_Alpha", "notes"])
+    assert info == "1 Alpha\n", repr(info)
+
+
+def test_skips_invalid_names():
+    """Profile names that fail validate_profile_name are not listed"""
+    info = _update("1 Alpha\n", ["profile_Alpha", "profile_ThisNameIsWayTooLong"])
+    assert info == "1 Alpha\n", repr(info)
+
+
+def test_deploy_profile():
+    """deploy_profile copies one profile (without README files) and find_next_profile_number counts past it"""
+    with tempfile.TemporaryDirectory() as tmp:
+        source = Path(tmp) / "src" / "Alpha"
+        sd_root = Path(tmp) / "sd"
+        source.mkdir(parents=True)
+        sd_root.mkdir()
+        (source / "config.txt").write_text("z1 A\n", encoding="utf-8")
+        (source / "README.md").write_text("# Alpha\n", encoding="utf-8")
+        (sd_root / "profile3_Old").mkdir()
+        
+        deployer = ProfileDeployer(force=True)
+        assert deployer.deploy_profile(source, sd_root, 0), "deploy_profile failed"
+        assert (sd_root / "profile_Alpha" / "config.txt").read_text(encoding="utf-8") == "z1 A\n"
+        assert not (sd_root / "profile_Alpha" / "README.md").exists(), "README.md was deployed"
+        assert deployer.deploy_profile(source, sd_root, 0), "redeploying an unchanged profile failed"
+        assert deployer.find_next_profile_number(sd_root) == 4
+
+
+def test_profile_unchanged():
+    """Deployed copies match by size and mtime first, then by content"""
+    with tempfile.TemporaryDirectory() as tmp:
+        source = Path(tmp) / "Alpha"
+        dest = Path(tmp) / "profile_Alpha"
+        source.mkdir()
+        (source / "key1.txt").write_text("STRING a\n", encoding="utf-8")
+        (source / "README.md").write_text("# Alpha\n", encoding="utf-8")
+        shutil.copytree(source, dest)
+        (dest / "README.md").unlink()
+        assert _profile_unchanged(source, dest), "identical copy reported as changed"
+        
+        # Same size and contents, but an mtime outside FAT's 2-second window
+        st = os.stat(source / "key1.txt")
+        os.utime(dest / "key1.txt", ns=(st.st_atime_ns, st.st_mtime_ns - 5_000_000_000))
+        assert not _profile_unchanged(source, dest), "mtime difference ignored"
+        
+        # Same size and mtime, different contents
+        (dest / "key1.txt").write_text("STRING b\n", encoding="utf-8")
+        os.utime(dest / "key1.txt", ns=(st.st_atime_ns, st.st_mtime_ns))
+        assert not _profile_unchanged(source, dest), "changed contents not detected"
+
+
+def main():
+    """Run all tests"""
+    print_color("=" * 60, "cyan")
+    print_color("profile_info.txt Update Tests", "cyan")
+    print_color("=" * 60, "cyan")
+    
+    tests = [
+        test_preserves_existing_entries,
+        test_drops_missing_and_appends_new,
+        test_duplicate_entries,
+        test_skips_staging_dirs,
+        test_skips_invalid_names,
+        test_deploy_profile,
+        test_profile_unchanged,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print_color(f"  ✓ {test.__doc__}", "green")
+        except AssertionError as e:
+            print_color(f"  ✗ {test.__doc__}: {e}", "red")
+            failed += 1
+    
+    print_color("\n" + "=" * 60, "cyan")
+    print_color(f"Results: {len(tests) - failed} passed, {failed} failed", "white")
+    print_color("=" * 60, "cyan")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
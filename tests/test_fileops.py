@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Test the shared file copy helpers
+
+Copies files inside a temporary directory, including through a stand-in
+copy_file_range() that reports end of file right away (as some filesystems
+and FUSE mounts do).
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add tools directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'tools'))
+
+from shared import fileops  # type: ignore
+from shared.console import print_color  # type: ignore
+
+
+def test_copy_data():
+    """copy_data copies empty and non-empty files"""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        for name, data in (("empty.txt", b""), ("key1.dsb", os.urandom(3 * fileops.COPY_BUFFER_SIZE + 7))):
+            (tmp / name).write_bytes(data)
+            fileops.copy_data(str(tmp / name), str(tmp / f"copy-{name}"))
+            assert (tmp / f"copy-{name}").read_bytes() == data, f"{name} copied incorrectly"
+
+
+def test_copy_file_range_reports_eof():
+    """A copy_file_range() that copies nothing from a non-empty file falls back"""
+    if not hasattr(os, "copy_file_range"):
+        return
+    
+    saved_copy_file_range = os.copy_file_range
+    os.copy_file_range = lambda in_fd, out_fd, count: 0
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            (tmp / "key1.txt").write_bytes(b"STRING a\n")
+            (tmp / "empty.txt").write_bytes(b"")
+            with open(tmp / "key1.txt", "rb") as fsrc, open(tmp / "out", "wb") as fdst:
+                assert not fileops._copy_file_range(fsrc, fdst), "empty copy reported as complete"
+            with open(tmp / "empty.txt", "rb") as fsrc, open(tmp / "out", "wb") as fdst:
+                assert fileops._copy_file_range(fsrc, fdst), "empty file not reported as copied"
+            
+            fileops.copy_data(str(tmp / "key1.txt"), str(tmp / "copy.txt"))
+            assert (tmp / "copy.txt").read_bytes() == b"STRING a\n", "fallback copy failed"
+    finally:
+        os.copy_file_range = saved_copy_file_range
+
+
+def main():
+    """Run all tests"""
+    print_color("=" * 60, "cyan")
+    print_color("File Copy Tests", "cyan")
+    print_color("=" * 60, "cyan")
+    
+    tests = [
+        test_copy_data,
+        test_copy_file_range_reports_eof,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print_color(f"  ✓ {test.__doc__}", "green")
+        except AssertionError as e:
+            print_color(f"  ✗ {test.__doc__}: {e}", "red")
+            failed += 1
+    
+    print_color("\n" + "=" * 60, "cyan")
+    print_color(f"Results: {len(tests) - failed} passed, {failed} failed", "white")
+    print_color("=" * 60, "cyan")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Test profile generation helpers
+
+Covers skipping unchanged files when regenerating a profile, profiles whose
+layers share a folder, stopping or failing part-way through pooled
+generation, the line endings of generated files, and the built-in
+CSS3 color table.
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add tools directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'tools'))
+
+import generate  # type: ignore
+from generate import YAMLToProfileConverter  # type: ignore
+from shared.validators import ValidationError  # type: ignore
+from shared.colors import parse_color, get_available_colors  # type: ignore
+from shared.console import print_color  # type: ignore
+
+
+SAMPLE_YAML = """profile:
+  name: TP
+  keys:
+    1: {label: A, script: STRING a, color: [255, 0, 0]}
+  layers:
+    fn:
+      name: TP-fn
+      keys:
+        1: {label: B, script: STRING b}
+"""
+
+
+def _converter(yaml_path: Path, profiles_root: Path) -> YAMLToProfileConverter:
+    """Create a converter writing the main profile and its layers under profiles_root"""
+    converter = YAMLToProfileConverter(yaml_path, output_dir=profiles_root / "TP")
+    converter._profiles_root = profiles_root  # Layers default to workbench/profiles
+    return converter
+
+
+def test_write_text_skips_unchanged():
+    """_write_text leaves a file holding identical text untouched"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "key1.txt"
+        assert YAMLToProfileConverter._write_text(path, ["STRING a"]), "new file not written"
+        assert path.read_bytes() == f"STRING a{os.linesep}".encode()
+        
+        os.utime(path, ns=(0, 0))
+        assert not YAMLToProfileConverter._write_text(path, ["STRING a"]), "identical text rewritten"
+        assert os.stat(path).st_mtime_ns == 0, "identical text changed the mtime"
+        
+        # Same size, different bytes: must still be written
+        assert YAMLToProfileConverter._write_text(path, ["STRING b"]), "changed text not written"
+        assert path.read_bytes() == f"STRING b{os.linesep}".encode()
+        
+        assert YAMLToProfileConverter._write_text(path, []), "emptied file not written"
+        assert path.read_bytes() == b""
+
+
+def test_regenerate_keeps_mtimes():
+    """Regenerating an unchanged profile rewrites no files"""
+    with tempfile.TemporaryDirectory() as tmp:
+        yaml_path = Path(tmp) / "tp.yaml"
+        yaml_path.write_text(SAMPLE_YAML, encoding="utf-8")
+        profiles_root = Path(tmp) / "out"
+        
+        paths = list(_converter(yaml_path, profiles_root).iter_profiles())
+        files = [f for profile in paths for f in profile.iterdir()]
+        assert files, "nothing generated"
+        for f in files:
+            os.utime(f, ns=(0, 0))
+        
+        list(_converter(yaml_path, profiles_root).iter_profiles())
+        rewritten = [f.name for f in files if os.stat(f).st_mtime_ns != 0]
+        assert not rewritten, f"rewritten: {rewritten}"
+
+
+def test_shared_layer_folder():
+    """Layers with the same folder name are generated in order (last one wins)"""
+    shared_yaml = """profile:
+  name: TP
+  keys:
+    1: {label: A, script: STRING a}
+  layers:
+    one:
+      name: TP-x
+      keys:
+        1: {label: B, script: STRING b}
+    two:
+      name: TP-x
+      keys:
+        2: {label: C, script: STRING c}
+"""
+    with tempfile.TemporaryDirectory() as tmp:
+        yaml_path = Path(tmp) / "tp.yaml"
+        yaml_path.write_text(shared_yaml, encoding="utf-8")
+        profiles_root = Path(tmp) / "out"
+        
+        paths = list(_converter(yaml_path, profiles_root).iter_profiles())
+        assert paths[1] == paths[2], paths
+        config = (paths[2] / "config.txt").read_text(encoding="utf-8")
+        assert config == "z2 C\n", repr(config)
+
+
+def test_pool_stops_early():
+    """Profiles generated on the pool can be abandoned after the first one"""
+    with tempfile.TemporaryDirectory() as tmp:
+        yaml_path = Path(tmp) / "tp.yaml"
+        yaml_path.write_text(SAMPLE_YAML, encoding="utf-8")
+        
+        profiles = _converter(yaml_path, Path(tmp) / "out").iter_profiles()
+        assert next(profiles).name == "TP"
+        profiles.close()  # Runs the pool's cleanup with work possibly still pending
+
+
+def test_pool_layer_error():
+    """An error in one layer on the pool propagates unchanged"""
+    bad_yaml = SAMPLE_YAML.replace("name: TP-fn", "name: TP-NameIsWayTooLong")
+    with tempfile.TemporaryDirectory() as tmp:
+        yaml_path = Path(tmp) / "tp.yaml"
+        yaml_path.write_text(bad_yaml, encoding="utf-8")
+        
+        try:
+            list(_converter(yaml_path, Path(tmp) / "out").iter_profiles())
+        except ValidationError:
+            return
+        raise AssertionError("invalid layer name was accepted")
+
+
+def test_platform_line_endings():
+    """Generated files use the platform line ending, as a text-mode write would"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "key1.txt"
+        YAMLToProfileConverter._write_text(path, ["STRING a", "ENTER"])
+        assert path.read_bytes() == f"STRING a{os.linesep}ENTER{os.linesep}".encode(), path.read_bytes()
+        
+        # Windows line endings, including newlines inside a line
+        saved_newline = generate._NEWLINE
+        generate._NEWLINE = "\r\n"
+        try:
+            YAMLToProfileConverter._write_text(path, ["STRING a\nENTER"])
+        finally:
+            generate._NEWLINE = saved_newline
+        assert path.read_bytes() == b"STRING a\r\nENTER\r\n", path.read_bytes()
+
+
+def test_css3_colors():
+    """Color names resolve through the built-in CSS3 table"""
+    cases = [
+        ("red", (255, 0, 0)),
+        ("Dark Blue", (0, 0, 139)),
+        ("dark_blue", (0, 0, 139)),
+        ("lightgoldenrodyellow", (250, 250, 210)),
+        ("#00FF7F", (0, 255, 127)),
+        ("00ff7f", (0, 255, 127)),
+        ([1, 2, 3], (1, 2, 3)),
+    ]
+    for value, expected in cases:
+        assert parse_color(value) == expected, f"{value!r} -> {parse_color(value)}"
+    
+    for value in ("notacolor", "#FFF", "#GG0000", "0x1234"):
+        try:
+            parse_color(value)
+        except ValueError:
+            continue
+        raise AssertionError(f"{value!r} was accepted")
+    
+    colors = get_available_colors()
+    assert len(colors) == 147 and "aqua" in colors and colors == sorted(colors), len(colors)
+
+
+def main():
+    """Run all tests"""
+    print_color("=" * 60, "cyan")
+    print_color("Profile Generation Tests", "cyan")
+    print_color("=" * 60, "cyan")
+    
+    tests = [
+        test_write_text_skips_unchanged,
+        test_regenerate_keeps_mtimes,
+        test_shared_layer_folder,
+        test_pool_stops_early,
+        test_pool_layer_error,
+        test_platform_line_endings,
+        test_css3_colors,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print_color(f"  ✓ {test.__doc__}", "green")
+        except AssertionError as e:
+            print_color(f"  ✗ {test.__doc__}: {e}", "red")
+            failed += 1
+    
+    print_color("\n" + "=" * 60, "cyan")
+    print_color(f"Results: {len(tests) - failed} passed, {failed} failed", "white")
+    print_color("=" * 60, "cyan")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,24 +10,42 @@ Date: 2025-11-22
 """
 
 import argparse
+import json
+import os
 import shutil
 import sys
+import time
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Dict, List, Optional, Tuple
 
 # Add parent directory to path for imports
-sys.path.insert(0, str(Path(__file__).parent))
+_TOOLS_DIR = str(Path(__file__).parent)
+if _TOOLS_DIR not in sys.path:
+    sys.path.insert(0, _TOOLS_DIR)
 
 from shared.profiles import ProfileInfoManager
-from shared.console import print_color, print_verbose, prompt_yes_no
+from shared.console import print_color, print_verbose, prompt_yes_no, flush_output
+from shared.fileops import FAT_MTIME_RESOLUTION_NS, copy_file, file_digest
+
+
+# Per-backup file fingerprints used for incremental backups: {rel_path: [mtime_ns, size]},
+# plus a BLAKE2b hex digest for files modified within FAT_MTIME_RESOLUTION_NS of the backup
+MANIFEST_NAME = ".manifest.json"
+
+# Concurrent file copies. Reading from the card overlaps per-file FAT metadata
+# latency; writing to it (restore) stays at 2, as more writers thrash the card
+BACKUP_WORKERS = min(8, os.cpu_count() or 1)
+RESTORE_WORKERS = 2
 
 
 class BackupStats:
     """Track backup/restore statistics"""
     def __init__(self):
         self.backed_up = 0
+        self.linked = 0
         self.restored = 0
         self.failed = 0
 
@@ -47,13 +65,21 @@ class SDCardBackupRestore:
         self.force = force
         self.profile_manager = ProfileInfoManager()
     
-    def backup(self, sd_card_path: Optional[Path] = None, backup_path: Optional[Path] = None) -> Optional[Path]:
+    def backup(
+        self,
+        sd_card_path: Optional[Path] = None,
+        backup_path: Optional[Path] = None,
+        copy_function: Callable = copy_file,
+        workers: int = BACKUP_WORKERS
+    ) -> Optional[Path]:
         """
         Backup SD card contents.
         
         Args:
             sd_card_path: Path to SD card (auto-detected if not provided)
             backup_path: Optional custom backup location
+            copy_function: Function used to copy each file (src, dst), like shutil.copy2
+            workers: Number of files copied concurrently
             
         Returns:
             Path to backup directory if successful, None otherwise
@@ -84,27 +110,82 @@ class SDCardBackupRestore:
         # Print disclaimer about what gets backed up
         print_color("  Note: Backing up config and source files only (bytecode .dsb files excluded)", "gray")
         
+        # FAT stores mtimes in 2-second steps, so a file written shortly before
+        # the backup can change again without its mtime changing. Such files
+        # also get a content hash, and are only linked when it still matches
+        racy_after_ns = time.time_ns() - FAT_MTIME_RESOLUTION_NS
+        
         try:
             # Copy all files and directories except .dsb (can be regenerated)
-            for item in sd_card_path.rglob("*"):
-                if item.is_file():
+            # Walk with plain strings: Path objects per entry dominate on large cards
+            sd_root = str(sd_card_path)
+            backup_root = str(backup_path)
+            files_to_copy = []  # (source, destination, relative path)
+            dest_dirs = set()
+            
+            for dir_path, _, file_names in os.walk(sd_root):
+                rel_dir = os.path.relpath(dir_path, sd_root)
+                if rel_dir == os.curdir:
+                    rel_dir = ""
+                dest_dir = os.path.join(backup_root, rel_dir) if rel_dir else backup_root
+                
+                for file_name in file_names:
                     # Skip .dsb bytecode files (they can be regenerated from source)
-                    if item.suffix == ".dsb":
+                    if file_name.endswith(".dsb"):
                         continue
                     
-                    # Calculate relative path
-                    rel_path = item.relative_to(sd_card_path)
-                    dest_path = backup_path / rel_path
-                    
-                    # Create parent directory
-                    dest_path.parent.mkdir(parents=True, exist_ok=True)
-                    
-                    # Copy file
-                    shutil.copy2(item, dest_path)
+                    dest_dirs.add(dest_dir)
+                    files_to_copy.append((
+                        os.path.join(dir_path, file_name),
+                        os.path.join(dest_dir, file_name),
+                        os.path.join(rel_dir, file_name),
+                    ))
+            
+            # Create every destination directory up front (parents before children)
+            dest_dirs.discard(backup_root)
+            for dest_dir in sorted(dest_dirs, key=len):
+                os.makedirs(dest_dir, exist_ok=True)
+            
+            # Copy files, hard-linking unchanged ones from the previous backup
+            previous_backup, previous_manifest = self._load_previous_manifest(backup_path)
+            
+            def backup_file(job: Tuple[str, str, str]) -> Tuple[List, bool]:
+                """Copy or link one file; returns (fingerprint, linked)"""
+                src, dest, rel_path = job
+                st = os.stat(src)
+                fingerprint = [st.st_mtime_ns, st.st_size]
+                if st.st_mtime_ns > racy_after_ns:
+                    fingerprint.append(file_digest(src).hex())
+                
+                previous = previous_manifest.get(rel_path)
+                if previous is not None and previous[:2] == fingerprint[:2]:
+                    # A previous copy taken within the mtime window must also match by content
+                    unchanged = len(previous) < 3 or previous[2] == (
+                        fingerprint[2] if len(fingerprint) > 2 else file_digest(src).hex()
+                    )
+                    if unchanged and self._link_from_previous(previous_backup, rel_path, dest):
+                        return fingerprint, True
+                copy_function(src, dest)
+                return fingerprint, False
+            
+            # Files are copied concurrently; results (and output) stay in walk order
+            manifest = {}
+            with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+                results = executor.map(backup_file, files_to_copy)
+                for (_, _, rel_path), (fingerprint, linked) in zip(files_to_copy, results):
+                    if linked:
+                        stats.linked += 1
+                    manifest[rel_path] = fingerprint
                     stats.backed_up += 1
-                    print_verbose(f"Backed up: {rel_path}", self.verbose)
+                    if self.verbose:
+                        print_verbose(f"Backed up: {rel_path}")
+            
+            self._save_manifest(backup_path, manifest)
             
+            flush_output()
             print_color(f"✓ Backup complete: {stats.backed_up} files backed up", "green")
+            if stats.linked:
+                print_color(f"  Unchanged since last backup (hard-linked): {stats.linked}", "gray")
             print_color(f"  Location: {backup_path}", "gray")
             
             return backup_path
@@ -113,6 +194,64 @@ class SDCardBackupRestore:
             print_color(f"✗ Backup failed: {e}", "red")
             return None
     
+    def _load_previous_manifest(self, backup_path: Path) -> Tuple[Optional[Path], Dict[str, List]]:
+        """
+        Load the file manifest of the most recent backup next to backup_path.
+        
+        Args:
+            backup_path: Backup directory being created
+            
+        Returns:
+            Tuple of (previous backup directory, manifest); (None, {}) if unavailable
+        """
+        for previous in self.list_backups(backup_path.parent):
+            if previous == backup_path:
+                continue
+            try:
+                with open(previous / MANIFEST_NAME, "r", encoding="utf-8") as f:
+                    return previous, json.load(f)
+            except (OSError, ValueError):
+                return None, {}
+        return None, {}
+    
+    def _link_from_previous(self, previous_backup: Path, rel_path: str, dest: str) -> bool:
+        """
+        Hard-link an unchanged file from the previous backup.
+        
+        Args:
+            previous_backup: Previous backup directory
+            rel_path: File path relative to the backup root
+            dest: Destination file path in the new backup
+            
+        Returns:
+            True if linked, False if the caller should copy instead
+        """
+        try:
+            os.link(os.path.join(str(previous_backup), rel_path), dest)
+            return True
+        except OSError:
+            # Missing file, existing destination, or no hard link support
+            return False
+    
+    def _save_manifest(self, backup_path: Path, manifest: Dict[str, List]):
+        """
+        Write the backup manifest atomically (temp file + rename).
+        
+        Args:
+            backup_path: Backup directory
+            manifest: Mapping of relative path to [mtime_ns, size] (plus a digest
+                for files modified just before the backup)
+        """
+        manifest_path = backup_path / MANIFEST_NAME
+        tmp_path = manifest_path.with_name(MANIFEST_NAME + ".tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(manifest, f)
+            os.replace(tmp_path, manifest_path)
+        except OSError as e:
+            # Manifest only speeds up the next backup; never fail the backup over it
+            print_verbose(f"Could not write backup manifest: {e}", self.verbose)
+    
     def list_backups(self, backup_root: Path = None) -> list:
         """
         List available backups.
@@ -134,7 +273,13 @@ class SDCardBackupRestore:
         
         return backups
     
-    def restore(self, backup_path: Path, sd_card_path: Path = None, force: bool = False) -> bool:
+    def restore(
+        self,
+        backup_path: Path,
+        sd_card_path: Path = None,
+        force: bool = False,
+        workers: int = RESTORE_WORKERS
+    ) -> bool:
         """
         Restore SD card from backup.
         
@@ -142,6 +287,7 @@ class SDCardBackupRestore:
             backup_path: Path to backup directory
             sd_card_path: Path to SD card (auto-detected if not provided)
             force: Skip confirmation prompts
+            workers: Number of files written to the SD card concurrently
             
         Returns:
             True if successful, False otherwise
@@ -167,7 +313,7 @@ class SDCardBackupRestore:
         print_color(f"\nBackup: {backup_path.name}", "cyan")
         
         # Count files in backup
-        backup_files = list(backup_path.rglob("*"))
+        backup_files = [f for f in backup_path.rglob("*") if f.name != MANIFEST_NAME]
         file_count = len([f for f in backup_files if f.is_file()])
         
         print_color(f"Files to restore: {file_count}", "cyan")
@@ -203,6 +349,7 @@ class SDCardBackupRestore:
         print_color("\n→ Restoring files from backup...", "cyan")
         stats = BackupStats()
         
+        jobs = []  # (source, destination, relative path)
         for src_path in backup_files:
             if not src_path.is_file():
                 continue
@@ -211,18 +358,31 @@ class SDCardBackupRestore:
             rel_path = src_path.relative_to(backup_path)
             dest_path = sd_card_path / rel_path
             
-            # Create parent directory if needed
+            # Create parent directory if needed (before any copies start)
             dest_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            # Copy file
+            jobs.append((src_path, dest_path, rel_path))
+        
+        def restore_file(job: Tuple[Path, Path, Path]) -> Optional[Exception]:
+            """Copy one file; returns the error, if any"""
+            src_path, dest_path, _ = job
             try:
                 shutil.copy2(src_path, dest_path)
-                stats.restored += 1
-                print_verbose(f"  Restored: {rel_path}", self.verbose)
+                return None
             except Exception as e:
-                print_color(f"  Warning: Could not restore {rel_path}: {e}", "yellow")
-                stats.failed += 1
+                return e
+        
+        # Copy concurrently; results (and output) stay in backup order
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            for (_, _, rel_path), error in zip(jobs, executor.map(restore_file, jobs)):
+                if error is None:
+                    stats.restored += 1
+                    if self.verbose:
+                        print_verbose(f"  Restored: {rel_path}")
+                else:
+                    print_color(f"  Warning: Could not restore {rel_path}: {error}", "yellow")
+                    stats.failed += 1
         
+        flush_output()
         print_color(f"✓ Restored {stats.restored} files", "green")
         
         # Summary
@@ -238,7 +398,7 @@ class SDCardBackupRestore:
         return True
 
 
-def backup_sd_card(sd_card_path: Optional[Path] = None, backup_path: Optional[Path] = None, verbose: bool = False) -> Optional[Path]:
+def backup_sd_card(sd_card_path: Optional[Path] = None, backup_path: Optional[Path] = None, verbose: bool = False, copy_function: Callable = copy_file, workers: int = BACKUP_WORKERS) -> Optional[Path]:
     """
     Backup SD card contents (programmatic interface).
     
@@ -246,15 +406,17 @@ def backup_sd_card(sd_card_path: Optional[Path] = None, backup_path: Optional[Pa
         sd_card_path: Path to SD card (auto-detected if not provided)
         backup_path: Custom backup location (default: ~/.duckypad/backups/backup_TIMESTAMP)
         verbose: Enable verbose output
+        copy_function: Function used to copy each file (default: shared.fileops.copy_file)
+        workers: Number of files copied concurrently
         
     Returns:
         Path to backup directory if successful, None otherwise
     """
     manager = SDCardBackupRestore(verbose=verbose)
-    return manager.backup(sd_card_path=sd_card_path, backup_path=backup_path)
+    return manager.backup(sd_card_path=sd_card_path, backup_path=backup_path, copy_function=copy_function, workers=workers)
 
 
-def restore_sd_card(backup_path: Path, sd_card_path: Optional[Path] = None, force: bool = False, verbose: bool = False) -> bool:
+def restore_sd_card(backup_path: Path, sd_card_path: Optional[Path] = None, force: bool = False, verbose: bool = False, workers: int = RESTORE_WORKERS) -> bool:
     """
     Restore SD card from backup (programmatic interface).
     
@@ -263,12 +425,13 @@ def restore_sd_card(backup_path: Path, sd_card_path: Optional[Path] = None, forc
         sd_card_path: Path to SD card (auto-detected if not provided)
         force: Skip confirmation prompts
         verbose: Enable verbose output
+        workers: Number of files written to the SD card concurrently
         
     Returns:
         True if successful, False otherwise
     """
     manager = SDCardBackupRestore(verbose=verbose)
-    return manager.restore(backup_path=backup_path, sd_card_path=sd_card_path, force=force)
+    return manager.restore(backup_path=backup_path, sd_card_path=sd_card_path, force=force, workers=workers)
 
 
 def main():
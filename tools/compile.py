@@ -5,15 +5,21 @@ Compiles .txt duckyScript source files to .dsb bytecode using make_bytecode.py
 """
 
 import argparse
+import hashlib
 import os
+import re
+import shutil
 import subprocess
 import sys
 import tempfile
+import time
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
 # Add shared directory to path for ProfileInfoManager
-sys.path.insert(0, str(Path(__file__).parent))
+_TOOLS_DIR = str(Path(__file__).parent)
+if _TOOLS_DIR not in sys.path:
+    sys.path.insert(0, _TOOLS_DIR)
 try:
     from shared.profiles import ProfileInfoManager, parse_key_settings, make_script_preamble
     from shared.console import print_color, print_verbose
@@ -29,6 +35,16 @@ except ImportError:
     VALIDATORS_AVAILABLE = False
 
 
+# Compiled .dsb files keyed by a hash of the final script and the compiler sources
+COMPILE_CACHE_DIR = Path.home() / ".duckypad" / "compile_cache"
+
+# Cache entries not used for this long are pruned
+COMPILE_CACHE_MAX_AGE = 30 * 24 * 60 * 60  # seconds
+
+# Key number prefix of a script filename stem ("key5-release" -> 5)
+_KEY_STEM_RE = re.compile(r'^key(\d+)')
+
+
 class CompilerStats:
     """Track compilation statistics"""
     def __init__(self):
@@ -67,6 +83,7 @@ class DuckyScriptCompiler:
         self.vendor_dir = self.script_dir / "vendor"
         self.compiler_path = self.vendor_dir / "make_bytecode.py"
         self.profile_manager = None
+        self._compiler_digest: Optional[bytes] = None
         
         # Initialize ProfileInfoManager if available and enabled
         if self.resolve_profiles and PROFILE_MANAGER_AVAILABLE:
@@ -226,6 +243,55 @@ class DuckyScriptCompiler:
         
         return not has_errors
     
+    def _cache_path(self, content: str) -> Path:
+        """Get the compile cache entry for a script
+        
+        The key covers the final script text (after GOTO_PROFILE resolution and
+        preamble injection) and the vendored compiler sources, so updating the
+        compiler invalidates every entry.
+        
+        Args:
+            content: Script text passed to the compiler
+            
+        Returns:
+            Path of the cached .dsb file (may not exist)
+        """
+        if self._compiler_digest is None:
+            digest = hashlib.blake2b(digest_size=16)
+            for source in sorted(self.vendor_dir.glob("*.py")):
+                digest.update(source.name.encode("utf-8"))
+                digest.update(source.read_bytes())
+            self._compiler_digest = digest.digest()
+        
+        key = hashlib.blake2b(content.encode("utf-8"), digest_size=16, key=self._compiler_digest)
+        return COMPILE_CACHE_DIR / f"{key.hexdigest()}.dsb"
+    
+    def _store_cached(self, dsb_path: Path, cache_path: Path):
+        """Save a freshly compiled .dsb file in the compile cache (best effort)
+        
+        Args:
+            dsb_path: Compiled bytecode file
+            cache_path: Cache entry to create
+        """
+        try:
+            COMPILE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+            shutil.copyfile(dsb_path, tmp_path)
+            os.replace(tmp_path, cache_path)  # Atomic, so parallel compiles never see partial entries
+        except OSError as e:
+            print_verbose(f"  Could not cache {dsb_path.name}: {e}", self.verbose)
+    
+    def prune_compile_cache(self):
+        """Delete compile cache entries that have not been used recently"""
+        cutoff = time.time() - COMPILE_CACHE_MAX_AGE
+        try:
+            with os.scandir(COMPILE_CACHE_DIR) as entries:
+                for entry in entries:
+                    if entry.is_file() and entry.stat().st_mtime < cutoff:
+                        os.unlink(entry.path)
+        except OSError:
+            pass
+    
     def compile_file(self, txt_path: Path, key_settings=None) -> bool:
         """Compile a single duckyScript file
         
@@ -275,6 +341,17 @@ class DuckyScriptCompiler:
                     content = preamble + content.lstrip()
                     print_verbose(f"  → Injected preamble: {', '.join(preamble_lines)}", self.verbose)
             
+            # Reuse the bytecode from an earlier compile of the identical script
+            cache_path = self._cache_path(content)
+            try:
+                shutil.copyfile(cache_path, dsb_path)
+                os.utime(cache_path)  # Mark as recently used
+            except OSError:
+                pass  # Not cached (or pruned meanwhile): compile it below
+            else:
+                print_color(f"  ✓ {txt_path.name} → {dsb_path.name} (cached)", "green")
+                return True
+            
             # Create a temporary file with the (potentially transformed) content
             with tempfile.NamedTemporaryFile(mode="w", suffix=".txt", delete=False, encoding="utf-8") as tmp:
                 tmp.write(content)
@@ -294,6 +371,7 @@ class DuckyScriptCompiler:
                 )
                 
                 if result.returncode == 0:
+                    self._store_cached(dsb_path, cache_path)
                     print_color(f"  ✓ {txt_path.name} → {dsb_path.name}", "green")
                     return True
                 else:
@@ -382,8 +460,7 @@ class DuckyScriptCompiler:
         Returns:
             Key number (1-26) or None if not parseable
         """
-        import re
-        match = re.match(r'^key(\d+)', stem)
+        match = _KEY_STEM_RE.match(stem)
         if match:
             key_num = int(match.group(1))
             if 1 <= key_num <= 26:
@@ -426,11 +503,13 @@ class DuckyScriptCompiler:
         
         return total_stats
     
-    def run(self, profile_path: Optional[Path] = None) -> int:
+    def run(self, profile_path: Optional[Path] = None, prune_cache: bool = True) -> int:
         """Run the compiler
         
         Args:
             profile_path: Optional path to specific profile or profiles directory
+            prune_cache: Prune stale compile cache entries first (launchers running
+                several compiles in parallel prune once themselves and pass False)
             
         Returns:
             Exit code (0 for success, 1 for failure)
@@ -452,6 +531,9 @@ class DuckyScriptCompiler:
         else:
             print_verbose("\n→ Using existing compiler", self.verbose)
         
+        if prune_cache:
+            self.prune_compile_cache()
+        
         # Compile profiles
         if profile_path is None:
             # Default to profiles directory
@@ -502,13 +584,19 @@ class DuckyScriptCompiler:
         return 0
 
 
-def compile(profile_path: Optional[Path] = None, verbose: bool = False, resolve_profiles: bool = True) -> int:
+def compile(
+    profile_path: Optional[Path] = None,
+    verbose: bool = False,
+    resolve_profiles: bool = True,
+    prune_cache: bool = True
+) -> int:
     """Compile duckyScript files to bytecode (programmatic interface)
     
     Args:
         profile_path: Path to specific profile or profiles directory (default: profiles/)
         verbose: Enable verbose output
         resolve_profiles: Enable automatic GOTO_PROFILE name resolution
+        prune_cache: Prune stale compile cache entries before compiling
         
     Returns:
         Exit code (0 = success, 1 = failure)
@@ -518,7 +606,7 @@ def compile(profile_path: Optional[Path] = None, verbose: bool = False, resolve_
         from the SD card to resolve GOTO_PROFILE name references.
     """
     compiler = DuckyScriptCompiler(verbose=verbose, resolve_profiles=resolve_profiles)
-    return compiler.run(profile_path=profile_path)
+    return compiler.run(profile_path=profile_path, prune_cache=prune_cache)
 
 
 def main():
@@ -5,17 +5,23 @@ Backs up SD card, deploys profiles to duckyPad, updates profile_info.txt
 """
 
 import argparse
+import os
+import re
 import shutil
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
 # Add shared directory to path for imports
-sys.path.insert(0, str(Path(__file__).parent))
+_TOOLS_DIR = str(Path(__file__).parent)
+if _TOOLS_DIR not in sys.path:
+    sys.path.insert(0, _TOOLS_DIR)
 from shared.profiles import ProfileInfoManager
 from shared.console import print_color, print_verbose, prompt_yes_no
+from shared.fileops import FAT_MTIME_RESOLUTION_NS, copy_file, file_digest
 from shared.validators import (
     ValidationError,
     validate_profile_count,
@@ -26,6 +32,179 @@ from shared.validators import (
 )
 from backup import backup_sd_card
 
+try:
+    from device import DuckyPadDevice
+except ImportError:
+    DuckyPadDevice = None
+
+try:
+    import inotify_simple  # type: ignore
+    HAS_INOTIFY = True
+except ImportError:
+    HAS_INOTIFY = False
+
+
+# Concurrent profile copies to the SD card. Keep this at 2 or below: beyond
+# that, parallel writes thrash the card's flash translation layer
+DEPLOY_WORKERS = 2
+
+# Where the last detected SD card mount point is remembered between runs
+LAST_SD_PATH_FILE = Path.home() / ".duckypad" / "last_sd_path"
+
+# Matches profile directories ("profileN_Name", "profile_Name", legacy "profileN")
+# Group 1: text between "profile" and the first "_" (the number, if any)
+# Group 2: profile name after the first "_" (None for the legacy format)
+_PROFILE_DIR_RE = re.compile(r"profile([^_]*)(?:_(.*))?", re.IGNORECASE | re.DOTALL)
+
+
+def _ignore_readme(directory: str, files: List[str]) -> List[str]:
+    """Ignore README.md and readme files during copy (copytree ignore callback)
+    
+    Only the first six characters of each name are upper-cased.
+    """
+    return [f for f in files if f[:6].upper() == "README"]
+
+
+def _list_profile_files(root: Path) -> Dict[str, Tuple[int, int]]:
+    """List deployable files under a profile directory
+    
+    Args:
+        root: Profile directory
+        
+    Returns:
+        Dictionary mapping relative file path to (size in bytes, mtime in ns)
+        (README files excluded)
+    """
+    files = {}
+    root_str = str(root)
+    for dir_path, dir_names, file_names in os.walk(root_str):
+        dir_names[:] = [d for d in dir_names if d[:6].upper() != "README"]
+        rel_dir = os.path.relpath(dir_path, root_str)
+        for file_name in file_names:
+            if file_name[:6].upper() == "README":
+                continue
+            rel_path = file_name if rel_dir == os.curdir else os.path.join(rel_dir, file_name)
+            st = os.stat(os.path.join(dir_path, file_name))
+            files[rel_path] = (st.st_size, st.st_mtime_ns)
+    return files
+
+
+def _profile_unchanged(source_path: Path, dest_path: Path) -> bool:
+    """Check whether a deployed profile already matches its source
+    
+    Deploys preserve mtimes, so a file whose size or mtime differs from its
+    deployed copy has changed and nothing is read. Only when every file's
+    size and mtime match (mtimes within FAT_MTIME_RESOLUTION_NS, as FAT
+    stores them in 2-second steps) are the contents hashed to confirm.
+    
+    Args:
+        source_path: Source profile directory
+        dest_path: Deployed profile directory on the SD card
+        
+    Returns:
+        True if every deployable file is byte-identical, False otherwise
+    """
+    if not dest_path.is_dir():
+        return False
+    
+    source_files = _list_profile_files(source_path)
+    dest_files = _list_profile_files(dest_path)
+    if source_files.keys() != dest_files.keys():
+        return False
+    for rel_path, (size, mtime_ns) in source_files.items():
+        dest_size, dest_mtime_ns = dest_files[rel_path]
+        if size != dest_size or abs(mtime_ns - dest_mtime_ns) > FAT_MTIME_RESOLUTION_NS:
+            return False
+    
+    source_root = str(source_path)
+    dest_root = str(dest_path)
+    return all(
+        file_digest(os.path.join(source_root, rel_path)) == file_digest(os.path.join(dest_root, rel_path))
+        for rel_path in source_files
+    )
+
+
+def _check_source_profile(profile_path: Path) -> Tuple[bool, List[Tuple[str, str]]]:
+    """Check that a source profile can be deployed
+    
+    Args:
+        profile_path: Profile directory to check
+        
+    Returns:
+        Tuple of (deployable, [(message, color), ...]) for the caller to print
+    """
+    # One listdir doubles as the existence and directory check (no extra stats)
+    try:
+        names = os.listdir(profile_path)
+    except FileNotFoundError:
+        return False, [(f"✗ Profile not found: {profile_path}", "red")]
+    except NotADirectoryError:
+        return False, [(f"✗ Not a directory: {profile_path}", "red")]
+    except OSError as e:
+        return False, [(f"✗ Cannot read {profile_path}: {e}", "red")]
+    
+    # Check for required files (config.txt and at least one key file)
+    messages = []
+    
+    if "config.txt" not in names:
+        messages.append((f"⚠ {profile_path.name}: Missing config.txt", "yellow"))
+    
+    if not any(name.startswith("key") and name.endswith(".txt") for name in names):
+        messages.append((f"⚠ {profile_path.name}: No key files found", "yellow"))
+    
+    return True, messages
+
+
+def _create_mount_watcher():
+    """Watch removable-media mount directories for new mount points (Linux only)
+    
+    Returns:
+        inotify_simple.INotify instance, or None if inotify is unavailable
+    """
+    if not HAS_INOTIFY:
+        return None
+    
+    user = os.environ.get("USER", "")
+    candidates = ["/media", f"/media/{user}", f"/run/media/{user}", "/mnt"]
+    watch_dirs = [d for d in candidates if os.path.isdir(d)]
+    if not watch_dirs:
+        return None
+    
+    try:
+        watcher = inotify_simple.INotify()
+        mask = inotify_simple.flags.CREATE | inotify_simple.flags.MOVED_TO
+        for watch_dir in watch_dirs:
+            watcher.add_watch(watch_dir, mask)
+        return watcher
+    except OSError:
+        return None
+
+
+def _load_last_sd_path() -> Optional[Path]:
+    """Read the SD card mount point remembered from the last deployment
+    
+    Returns:
+        Remembered SD card path, or None if there is none
+    """
+    try:
+        text = LAST_SD_PATH_FILE.read_text(encoding="utf-8").strip()
+    except OSError:
+        return None
+    return Path(text) if text else None
+
+
+def _save_last_sd_path(sd_card_path: Path):
+    """Remember the SD card mount point for the next deployment (best effort)
+    
+    Args:
+        sd_card_path: Path to SD card
+    """
+    try:
+        LAST_SD_PATH_FILE.parent.mkdir(parents=True, exist_ok=True)
+        LAST_SD_PATH_FILE.write_text(f"{sd_card_path}\n", encoding="utf-8")
+    except OSError:
+        pass
+
 
 class DeploymentStats:
     """Track deployment statistics"""
@@ -57,6 +236,30 @@ class ProfileDeployer:
         self.force = force
         self.auto_unmount = auto_unmount
         self.profile_manager = ProfileInfoManager()
+        
+        # Cached (sd_card_path, directory names) for the SD card root; reset after deploys
+        self._sd_dirs: Optional[Tuple[Path, List[str]]] = None
+        
+        # SD card mount point from the previous run, checked first while waiting
+        self._last_known_sd_path = _load_last_sd_path()
+    
+    def _scan_sd_dirs(self, sd_card_path: Path) -> List[str]:
+        """List directory names in the SD card root
+        
+        The listing is cached so one deployment run reads the (slow) SD card
+        root once instead of once per step. _copy_profile invalidates it.
+        
+        Args:
+            sd_card_path: Path to SD card
+            
+        Returns:
+            Directory names in the SD card root (unsorted)
+        """
+        if self._sd_dirs is None or self._sd_dirs[0] != sd_card_path:
+            with os.scandir(sd_card_path) as entries:
+                names = [entry.name for entry in entries if entry.is_dir(follow_symlinks=False)]
+            self._sd_dirs = (sd_card_path, names)
+        return self._sd_dirs[1]
     
     def find_next_profile_number(self, sd_card_path: Path) -> int:
         """Find next available profile number on SD card
@@ -67,72 +270,105 @@ class ProfileDeployer:
         Returns:
             Next available profile number (1-based)
         """
-        existing_profiles = [
-            d for d in sd_card_path.iterdir()
-            if d.is_dir() and d.name.lower().startswith("profile")
-        ]
-        
-        if not existing_profiles:
-            return 1
-        
-        # Extract numbers from profile directories
-        numbers = []
-        for profile_dir in existing_profiles:
-            try:
-                # Extract number from "profileN_Name" format
-                name_parts = profile_dir.name.split("_", 1)
-                if name_parts[0].lower().startswith("profile"):
-                    num_str = name_parts[0][7:]  # Skip "profile" prefix
-                    if num_str.isdigit():
-                        numbers.append(int(num_str))
-            except (ValueError, IndexError):
-                continue
-        
-        if not numbers:
-            return 1
-        
-        return max(numbers) + 1
+        # Highest N among "profileN_Name" directories (no intermediate lists)
+        return max(
+            (
+                int(match.group(1))
+                for dir_name in self._scan_sd_dirs(sd_card_path)
+                if (match := _PROFILE_DIR_RE.match(dir_name)) and match.group(1).isdecimal()
+            ),
+            default=0
+        ) + 1
     
     def deploy_profile(self, source_path: Path, sd_card_path: Path, profile_number: int) -> bool:
         """Deploy a single profile to SD card
         
+        run() does the same in two phases (_prepare_profile, then _copy_profile
+        on a worker pool); this deploys one profile in a single call.
+        
         Args:
             source_path: Path to source profile directory
             sd_card_path: Path to SD card
             profile_number: Profile number to assign (unused, kept for compatibility)
             
         Returns:
-            True if successful, False otherwise
+            True if successful (or already up to date), False otherwise
         """
         # Generate profile directory name (just profile_<name>, no number)
-        profile_name = source_path.name
-        dest_name = f"profile_{profile_name}"
-        dest_path = sd_card_path / dest_name
+        dest_path = sd_card_path / f"profile_{source_path.name}"
         
-        print_verbose(f"Deploying: {profile_name} → {dest_name}", self.verbose)
+        if self.verbose:
+            print_verbose(f"Deploying: {source_path.name} → {dest_path.name}")
         
         try:
-            # Check if destination already exists
-            if dest_path.exists():
-                if not self.force:
-                    print_color(f"  Warning: {dest_name} already exists", "yellow")
-                    if not prompt_yes_no(f"  Overwrite {dest_name}?", default=True, force=False):
-                        print_color(f"  Skipped: {profile_name}", "yellow")
-                        return False
-                shutil.rmtree(dest_path)
+            unchanged = self._prepare_profile(source_path, dest_path)
+        except Exception as e:
+            print_color(f"  ✗ Failed to deploy {source_path.name}: {e}", "red")
+            return False
+        
+        if unchanged is None:
+            return False
+        if unchanged:
+            return True
+        return self._copy_profile(source_path, dest_path)
+    
+    def _prepare_profile(self, source_path: Path, dest_path: Path) -> Optional[bool]:
+        """Check a profile's destination and confirm overwriting it
+        
+        Args:
+            source_path: Path to source profile directory
+            dest_path: Path to the profile directory on the SD card
+            
+        Returns:
+            True if the SD card already holds an identical copy, False if the
+            profile should be copied, None if the user chose to skip it
+        """
+        # Nothing to do if the SD card already holds an identical copy
+        if _profile_unchanged(source_path, dest_path):
+            print_color(f"  ✓ Unchanged: {dest_path.name}", "green")
+            return True
+        
+        # Check if destination already exists
+        if dest_path.exists() and not self.force:
+            print_color(f"  Warning: {dest_path.name} already exists", "yellow")
+            if not prompt_yes_no(f"  Overwrite {dest_path.name}?", default=True):
+                print_color(f"  Skipped: {source_path.name}", "yellow")
+                return None
+        
+        return False
+    
+    def _copy_profile(self, source_path: Path, dest_path: Path) -> bool:
+        """Copy a profile directory into place on the SD card (no prompts)
+        
+        Args:
+            source_path: Path to source profile directory
+            dest_path: Path to the profile directory on the SD card
             
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            # Copy into a sibling staging directory, then swap it into place so an
+            # interrupted deploy never leaves a half-written profile behind. The
+            # prefixes keep leftovers from matching _PROFILE_DIR_RE
+            staging_path = dest_path.with_name(".tmp-" + dest_path.name)
+            old_path = dest_path.with_name(".old-" + dest_path.name)
+            shutil.rmtree(staging_path, ignore_errors=True)  # Leftover from an interrupted run
             # Copy profile directory (excluding README files)
-            def ignore_readme(directory, files):
-                """Ignore README.md and readme files during copy"""
-                return [f for f in files if f.upper().startswith('README')]
+            shutil.copytree(source_path, staging_path, ignore=_ignore_readme, copy_function=copy_file)
             
-            shutil.copytree(source_path, dest_path, ignore=ignore_readme)
+            if dest_path.exists():
+                shutil.rmtree(old_path, ignore_errors=True)
+                os.replace(dest_path, old_path)
+            os.replace(staging_path, dest_path)
+            shutil.rmtree(old_path, ignore_errors=True)
+            self._sd_dirs = None  # SD card root changed
             
-            print_color(f"  ✓ Deployed: {dest_name}", "green")
+            print_color(f"  ✓ Deployed: {dest_path.name}", "green")
             return True
             
         except Exception as e:
-            print_color(f"  ✗ Failed to deploy {profile_name}: {e}", "red")
+            print_color(f"  ✗ Failed to deploy {source_path.name}: {e}", "red")
             return False
     
     def update_profile_info(self, sd_card_path: Path) -> bool:
@@ -154,101 +390,95 @@ class ProfileDeployer:
             profile_info_path = sd_card_path / "profile_info.txt"
             
             # Read existing profile_info.txt to preserve order
-            existing_profiles = {}  # name -> number mapping
+            existing_numbers: Dict[str, int] = {}  # name -> number, in file order
             if profile_info_path.exists():
                 try:
-                    with open(profile_info_path, "r", encoding="utf-8") as f:
-                        for line in f:
-                            line = line.strip()
-                            if not line:
-                                continue
-                            parts = line.split(maxsplit=1)
-                            if len(parts) == 2:
-                                try:
-                                    num = int(parts[0])
-                                    name = parts[1]
-                                    existing_profiles[name] = num
-                                    print_verbose(f"Existing: {num} {name}", self.verbose)
-                                except ValueError:
-                                    continue
+                    # One read and decode, then split in memory
+                    for line in profile_info_path.read_text(encoding="utf-8").splitlines():
+                        # Format: "N ProfileName" (names may contain spaces)
+                        num_str, sep, name = line.strip().partition(" ")
+                        if not sep:
+                            continue
+                        try:
+                            num = int(num_str)
+                        except ValueError:
+                            continue
+                        existing_numbers.setdefault(name, num)  # First entry wins
+                        if self.verbose:
+                            print_verbose(f"Existing: {num} {name}")
                 except Exception as e:
-                    print_verbose(f"Could not read existing profile_info.txt: {e}", self.verbose)
+                    if self.verbose:
+                        print_verbose(f"Could not read existing profile_info.txt: {e}")
             
             # Find all profile directories on SD card
-            all_dirs = sorted([
-                d for d in sd_card_path.iterdir()
-                if d.is_dir()
-            ])
+            dir_names = self._scan_sd_dirs(sd_card_path)
             
-            if not all_dirs:
+            if not dir_names:
                 print_color("  No directories found", "yellow")
                 return False
             
-            # Extract profile names from directories
-            profile_names = []
-            for profile_dir in all_dirs:
-                dir_name = profile_dir.name
-                
-                # Extract name from "profileN_Name" format or use directory name
-                if dir_name.lower().startswith("profile") and "_" in dir_name:
-                    name_parts = dir_name.split("_", 1)
-                    if len(name_parts) == 2:
-                        profile_name = name_parts[1]
-                    else:
-                        continue
-                elif dir_name.lower().startswith("profile"):
-                    # Legacy format: use the whole directory name
-                    profile_name = dir_name
-                else:
+            # One pass over the cached listing: parse each profile directory name
+            # and sort it into already-listed or new (as (directory name, profile name))
+            present = set()
+            new_dirs = []
+            for dir_name in dir_names:
+                match = _PROFILE_DIR_RE.match(dir_name)
+                if not match:
                     # Not a profile directory, skip
                     continue
                 
-                profile_names.append(profile_name)
+                # Extract name from "profileN_Name" format, or use the whole
+                # directory name for the legacy format
+                name = dir_name if match.group(2) is None else match.group(2)
+                if name in existing_numbers:
+                    present.add(name)
+                else:
+                    new_dirs.append((dir_name, name))
             
-            if not profile_names:
+            if not present and not new_dirs:
                 print_color("  No valid profiles found", "yellow")
                 return False
             
-            # Build final entries list
-            # 1. Keep existing profiles in their original order
-            # 2. Append new profiles at the end
+            # 1. Keep existing profiles in their original (file) order
             final_entries = []
-            used_numbers = set()
-            
-            # Add existing profiles first (preserving order)
-            for name in profile_names:
-                if name in existing_profiles:
-                    num = existing_profiles[name]
+            next_number = 1
+            for name, num in existing_numbers.items():
+                if name in present:
                     final_entries.append((num, name))
-                    used_numbers.add(num)
-                    print_verbose(f"Preserved: {num} {name}", self.verbose)
-            
-            # Sort existing entries by number to maintain order
-            final_entries.sort(key=lambda x: x[0])
-            
-            # Find next available number for new profiles
-            if used_numbers:
-                next_number = max(used_numbers) + 1
-            else:
-                next_number = 1
-            
-            # Add new profiles at the end
-            for name in profile_names:
-                if name not in existing_profiles:
-                    # Validate profile name before adding
-                    valid, error = validate_profile_name(name)
-                    if not valid:
-                        print_color(f"  ⚠ Skipping invalid profile name '{name}': {error}", "yellow")
-                        continue
-                    
-                    final_entries.append((next_number, name))
-                    print_verbose(f"Added: {next_number} {name}", self.verbose)
-                    next_number += 1
+                    if num >= next_number:
+                        next_number = num + 1
+                    if self.verbose:
+                        print_verbose(f"Preserved: {num} {name}")
+            
+            # 2. Append new profiles at the end, ordered by directory name (only
+            # these few are sorted, not the whole SD card listing)
+            listed = set()
+            for _, name in sorted(new_dirs):
+                if name in listed:
+                    continue
+                # Validate profile name before adding
+                valid, error = validate_profile_name(name)
+                if not valid:
+                    print_color(f"  ⚠ Skipping invalid profile name '{name}': {error}", "yellow")
+                    continue
+                
+                final_entries.append((next_number, name))
+                listed.add(name)
+                if self.verbose:
+                    print_verbose(f"Added: {next_number} {name}")
+                next_number += 1
             
-            # Write profile_info.txt
-            with open(profile_info_path, "w", encoding="utf-8") as f:
-                for profile_num, profile_name in final_entries:
-                    f.write(f"{profile_num} {profile_name}\n")
+            # Write profile_info.txt atomically: one write + fsync to a temp file,
+            # then rename over the original so a crash never leaves a partial index
+            payload = "".join(
+                f"{profile_num} {profile_name}\n" for profile_num, profile_name in final_entries
+            ).encode("utf-8")
+            tmp_path = profile_info_path.with_suffix(".txt.tmp")
+            with open(tmp_path, "wb") as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, profile_info_path)
             
             print_color(f"✓ Updated profile_info.txt with {len(final_entries)} profile(s)", "green")
             return True
@@ -257,6 +487,52 @@ class ProfileDeployer:
             print_color(f"✗ Failed to update profile_info.txt: {e}", "red")
             return False
     
+    def _wait_for_sd_card(self, max_wait: float = 10.0) -> Optional[Path]:
+        """Wait for the SD card to appear after a mount command
+        
+        Polls with exponential backoff (50 ms doubling to 800 ms). On Linux with
+        inotify_simple installed, each wait also ends early when a new mount
+        directory is created under /media, /run/media or /mnt. Each poll first
+        checks the mount point remembered from the last run (one stat call)
+        before enumerating mount points.
+        
+        Args:
+            max_wait: Maximum time to wait in seconds
+            
+        Returns:
+            Path to SD card if it appeared, None otherwise
+        """
+        watcher = _create_mount_watcher()
+        try:
+            start = time.monotonic()
+            delay = 0.05
+            while True:
+                elapsed = time.monotonic() - start
+                if elapsed >= max_wait:
+                    return None
+                
+                wait = min(delay, max_wait - elapsed)
+                if watcher is not None:
+                    watcher.read(timeout=int(wait * 1000))
+                else:
+                    time.sleep(wait)
+                delay = min(delay * 2, 0.8)
+                
+                # Fast path: the card usually comes back at its previous mount point
+                last_path = self._last_known_sd_path
+                if (last_path is not None and os.path.ismount(last_path)
+                        and (last_path / "profile_info.txt").is_file()):
+                    return last_path
+                
+                sd_card_path = self.profile_manager.detect_sd_card()
+                if sd_card_path:
+                    return sd_card_path
+                if self.verbose:
+                    print_verbose(f"Waiting... ({time.monotonic() - start:.1f}/{max_wait:.0f}s)")
+        finally:
+            if watcher is not None:
+                watcher.close()
+    
     def run(self, source_profiles: List[Path], backup_path: Optional[Path] = None) -> int:
         """Run the deployment process
         
@@ -281,8 +557,11 @@ class ProfileDeployer:
         if not sd_card_path:
             print_color("\n⚠ SD card not detected, attempting to mount...", "yellow")
             
-            # Import device controller
-            from device import DuckyPadDevice
+            if DuckyPadDevice is None:
+                print_color("✗ Device control unavailable (could not import device.py)", "red")
+                print_color("  Please mount the SD card manually and try again", "yellow")
+                return 1
+            
             device = DuckyPadDevice(verbose=self.verbose)
             
             # Try to mount
@@ -295,14 +574,7 @@ class ProfileDeployer:
             
             # Wait for SD card to appear
             print_color("  Waiting for SD card to appear...", "cyan")
-            max_wait = 10  # seconds
-            for i in range(max_wait):
-                time.sleep(1)
-                sd_card_path = self.profile_manager.detect_sd_card()
-                if sd_card_path:
-                    break
-                if self.verbose:
-                    print_color(f"  Waiting... ({i+1}/{max_wait})", "gray")
+            sd_card_path = self._wait_for_sd_card()
             
             if not sd_card_path:
                 print_color("✗ SD card did not appear after mounting", "red")
@@ -312,40 +584,31 @@ class ProfileDeployer:
             print_color("✓ SD card mounted successfully", "green")
         
         print_color(f"\n✓ SD card detected: {sd_card_path}", "green")
+        if sd_card_path != self._last_known_sd_path:
+            _save_last_sd_path(sd_card_path)
+            self._last_known_sd_path = sd_card_path
+        
+        # Validate source profiles (independent checks, run concurrently)
+        with ThreadPoolExecutor(max_workers=max(1, min(8, len(source_profiles)))) as executor:
+            results = list(executor.map(_check_source_profile, source_profiles))
         
-        # Validate source profiles
+        # Report in the original order
         valid_profiles = []
-        for profile_path in source_profiles:
-            if not profile_path.exists():
-                print_color(f"✗ Profile not found: {profile_path}", "red")
-                continue
-            
-            if not profile_path.is_dir():
-                print_color(f"✗ Not a directory: {profile_path}", "red")
-                continue
-            
-            # Check for required files (config.txt and at least one key file)
-            config_file = profile_path / "config.txt"
-            key_files = list(profile_path.glob("key*.txt"))
-            
-            if not config_file.exists():
-                print_color(f"⚠ {profile_path.name}: Missing config.txt", "yellow")
-            
-            if not key_files:
-                print_color(f"⚠ {profile_path.name}: No key files found", "yellow")
-            
-            valid_profiles.append(profile_path)
+        for profile_path, (ok, messages) in zip(source_profiles, results):
+            for message, color in messages:
+                print_color(message, color)
+            if ok:
+                valid_profiles.append(profile_path)
         
         if not valid_profiles:
             print_color("\n✗ No valid profiles to deploy", "red")
             return 1
         
         # Count existing profiles on SD card
-        existing_profile_dirs = [
-            d for d in sd_card_path.iterdir()
-            if d.is_dir() and d.name.lower().startswith("profile")
-        ]
-        existing_count = len(existing_profile_dirs)
+        existing_count = sum(
+            1 for dir_name in self._scan_sd_dirs(sd_card_path)
+            if _PROFILE_DIR_RE.match(dir_name)
+        )
         total_after_deployment = existing_count + len(valid_profiles)
         
         # Validate profile count
@@ -375,7 +638,15 @@ class ProfileDeployer:
             return 1
         
         # Backup SD card
-        backup_result = backup_sd_card(sd_card_path=sd_card_path, backup_path=backup_path, verbose=self.verbose)
+        # The backup goes from the SD card to a local disk, where cloning never applies;
+        # shutil.copy2 takes the OS copy fast path (sendfile on Linux, fcopyfile on
+        # macOS, CopyFile2 on Windows with Python 3.12+)
+        backup_result = backup_sd_card(
+            sd_card_path=sd_card_path,
+            backup_path=backup_path,
+            verbose=self.verbose,
+            copy_function=shutil.copy2
+        )
         if not backup_result:
             print_color("\n✗ Backup failed", "red")
             if not prompt_yes_no("Continue without backup?", default=False, force=self.force):
@@ -383,15 +654,36 @@ class ProfileDeployer:
         
         # Deploy profiles
         print_color("\n→ Deploying profiles...", "cyan")
-        next_number = self.find_next_profile_number(sd_card_path)
         
         stats = DeploymentStats()
+        
+        # Check destinations and ask about overwrites up front, so no prompt
+        # ever comes from a worker thread
+        to_copy = []
         for profile_path in valid_profiles:
-            if self.deploy_profile(profile_path, sd_card_path, next_number):
-                stats.deployed += 1
-                next_number += 1
-            else:
+            dest_path = sd_card_path / f"profile_{profile_path.name}"
+            if self.verbose:
+                print_verbose(f"Deploying: {profile_path.name} → {dest_path.name}")
+            try:
+                unchanged = self._prepare_profile(profile_path, dest_path)
+            except Exception as e:
+                print_color(f"  ✗ Failed to deploy {profile_path.name}: {e}", "red")
+                unchanged = None
+            
+            if unchanged is None:
                 stats.failed += 1
+            elif unchanged:
+                stats.skipped += 1
+            else:
+                to_copy.append((profile_path, dest_path))
+        
+        # Copy with at most DEPLOY_WORKERS writers (a second one overlaps directory
+        # setup with the other's writeback)
+        if to_copy:
+            with ThreadPoolExecutor(max_workers=min(DEPLOY_WORKERS, len(to_copy))) as executor:
+                results = list(executor.map(lambda job: self._copy_profile(*job), to_copy))
+            stats.deployed += results.count(True)
+            stats.failed += results.count(False)
         
         # Update profile_info.txt
         if not self.update_profile_info(sd_card_path):
@@ -403,6 +695,9 @@ class ProfileDeployer:
         print_color("=" * 60, "cyan")
         print_color(f"Profiles deployed:  {stats.deployed}", "green")
         
+        if stats.skipped > 0:
+            print_color(f"Unchanged:          {stats.skipped}", "white")
+        
         if stats.failed > 0:
             print_color(f"Failed:             {stats.failed}", "red")
         
@@ -419,14 +714,13 @@ class ProfileDeployer:
         
         if should_unmount:
             print_color("\n→ Unmounting SD card...", "cyan")
-            from device import DuckyPadDevice
-            device = DuckyPadDevice(verbose=self.verbose)
-            if device.unmount_sd_card():
+            device = DuckyPadDevice(verbose=self.verbose) if DuckyPadDevice is not None else None
+            if device is not None and device.unmount_sd_card():
                 print_color("✓ SD card unmounted, duckyPad rebooting to normal mode", "green")
             else:
                 print_color("⚠ Failed to unmount SD card", "yellow")
         
-        if stats.deployed > 0:
+        if stats.deployed > 0 or stats.skipped > 0:
             print_color("\n✓ Deployment complete!", "green")
             return 0
         else:
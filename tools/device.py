@@ -5,13 +5,17 @@ Mount/unmount SD card, detect connected duckyPad devices
 """
 import argparse
 import contextlib
-import io
 import sys
+import time
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 
 # Add vendor directory to path
-sys.path.insert(0, str(Path(__file__).parent / "vendor"))
+_VENDOR_DIR = str(Path(__file__).parent / "vendor")
+if _VENDOR_DIR not in sys.path:
+    sys.path.insert(0, _VENDOR_DIR)
+
+from shared.console import color_enabled
 
 try:
     import hid  # type: ignore
@@ -23,13 +27,60 @@ except ImportError:
 # HID command constant for software reset
 HID_COMMAND_SW_RESET = 20
 
+# Empty PC-to-duckyPad report, built once and copied for each command
+_TEMPLATE_BUF = get_empty_pc_to_duckypad_buf() if HID_AVAILABLE else None
+
+# How long a scan_duckypads() result is reused (HID paths rarely change within seconds)
+SCAN_CACHE_TTL = 2.0  # seconds
+
+# Last enumeration as (monotonic time, device list)
+_scan_cache: Optional[Tuple[float, List[Dict[str, Any]]]] = None
+
 
-def duckypad_hid_sw_reset(dp_dict: Dict[str, Any], reboot_into_usb_msc_mode: bool = False) -> bool:
+class _NullIO:
+    """Write sink that discards everything (for silencing vendor prints)"""
+    
+    def write(self, _: str) -> int:
+        return 0
+    
+    def flush(self):
+        pass
+
+
+_NULL_SINK = _NullIO()
+
+
+def scan_duckypads_cached(max_age: float = SCAN_CACHE_TTL) -> Optional[List[Dict[str, Any]]]:
+    """Scan for duckyPad devices, reusing a recent enumeration
+    
+    Args:
+        max_age: Maximum age in seconds of a cached result (0 forces a rescan)
+        
+    Returns:
+        List of device info dicts from scan_duckypads(), or None
+    """
+    global _scan_cache
+    
+    if _scan_cache is not None and time.monotonic() - _scan_cache[0] < max_age:
+        return _scan_cache[1]
+    
+    dp_list = scan_duckypads()
+    _scan_cache = (time.monotonic(), dp_list) if dp_list else None
+    return dp_list
+
+
+def duckypad_hid_sw_reset(
+    dp_dict: Dict[str, Any],
+    reboot_into_usb_msc_mode: bool = False,
+    dp_list: Optional[List[Dict[str, Any]]] = None
+) -> bool:
     """Send software reset command to duckyPad device
     
     Args:
         dp_dict: Device info dictionary from scan_duckypads()
         reboot_into_usb_msc_mode: True to mount SD card, False to unmount
+        dp_list: Fresh device list to look up the HID path in (default: scan,
+            reusing an enumeration from the last SCAN_CACHE_TTL seconds)
         
     Returns:
         True if reset command was sent successfully
@@ -38,29 +89,28 @@ def duckypad_hid_sw_reset(dp_dict: Dict[str, Any], reboot_into_usb_msc_mode: boo
         return False
         
     try:
-        # Scan again because HID path might have changed
-        dp_list = scan_duckypads()
+        # HID path might have changed since dp_dict was scanned, so look it up
+        # in a recent enumeration
+        if dp_list is None:
+            dp_list = scan_duckypads_cached()
         if dp_list is None or len(dp_list) == 0:
             return False
             
-        # Find device with matching serial
-        dp_to_reset_hid_path = []
-        for this_dp in dp_list:
-            if this_dp["serial"] == dp_dict["serial"]:
-                dp_to_reset_hid_path.append(this_dp["hid_path"])
-                
-        if len(dp_to_reset_hid_path) == 0:
+        # Find HID path of the device with matching serial
+        # (built from the reversed list so the first match wins, as before)
+        hid_path = {dp["serial"]: dp["hid_path"] for dp in reversed(dp_list)}.get(dp_dict["serial"])
+        if hid_path is None:
             return False
             
         # Build HID command buffer
-        pc_to_duckypad_buf = get_empty_pc_to_duckypad_buf()
+        pc_to_duckypad_buf = _TEMPLATE_BUF[:]
         pc_to_duckypad_buf[2] = HID_COMMAND_SW_RESET  # Command type
         if reboot_into_usb_msc_mode:
             pc_to_duckypad_buf[3] = 1
             
         # Send reset command
         myh = hid.device()
-        myh.open_path(dp_to_reset_hid_path[0])
+        myh.open_path(hid_path)
         myh.write(pc_to_duckypad_buf)
         myh.close()
         
@@ -79,9 +129,16 @@ class Colors:
     RESET = "\033[0m"
 
 
+if not color_enabled():
+    Colors.RED = Colors.GREEN = Colors.YELLOW = Colors.CYAN = Colors.RESET = ""
+
+# Suffix appended to every colored line
+_RESET_NEWLINE = Colors.RESET + "\n"
+
+
 def print_color(message: str, color: str):
-    """Print colored message"""
-    print(f"{color}{message}{Colors.RESET}")
+    """Print colored message (color is one of the Colors codes)"""
+    sys.stdout.write(f"{color}{message}{_RESET_NEWLINE}")
 
 
 class DuckyPadDevice:
@@ -111,7 +168,7 @@ class DuckyPadDevice:
             return None
         
         try:
-            devices = scan_duckypads()
+            devices = scan_duckypads_cached(max_age=0)
             if self.verbose and devices:
                 print_color(f"Found {len(devices)} duckyPad device(s):", Colors.GREEN)
                 for device in devices:
@@ -138,6 +195,7 @@ class DuckyPadDevice:
         
         try:
             # If no device specified, scan for devices
+            devices = None
             if device_dict is None:
                 devices = self.scan_devices()
                 if not devices or len(devices) == 0:
@@ -153,10 +211,8 @@ class DuckyPadDevice:
             
             # Reboot into USB mass storage mode (mounts SD card)
             # Suppress vendor debug output
-            
-            f = io.StringIO()
-            with contextlib.redirect_stdout(f):
-                duckypad_hid_sw_reset(device_dict, reboot_into_usb_msc_mode=True)
+            with contextlib.redirect_stdout(_NULL_SINK):
+                duckypad_hid_sw_reset(device_dict, reboot_into_usb_msc_mode=True, dp_list=devices)
             
             if self.verbose:
                 print_color("✓ SD card mount command sent", Colors.GREEN)
@@ -185,6 +241,7 @@ class DuckyPadDevice:
         
         try:
             # If no device specified, scan for devices
+            devices = None
             if device_dict is None:
                 devices = self.scan_devices()
                 if not devices or len(devices) == 0:
@@ -200,10 +257,8 @@ class DuckyPadDevice:
             
             # Reboot into normal mode (unmounts SD card)
             # Suppress vendor debug output
-            
-            f = io.StringIO()
-            with contextlib.redirect_stdout(f):
-                duckypad_hid_sw_reset(device_dict, reboot_into_usb_msc_mode=False)
+            with contextlib.redirect_stdout(_NULL_SINK):
+                duckypad_hid_sw_reset(device_dict, reboot_into_usb_msc_mode=False, dp_list=devices)
             
             if self.verbose:
                 print_color("✓ SD card unmount command sent", Colors.GREEN)
@@ -11,14 +11,16 @@ Author: JamesDBartlett3
 Date: 2025-11-22
 """
 
-import argparse
+import functools
+import os
 import sys
-import traceback
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterator, List, Optional
 
 # Add parent directory to path for imports
-sys.path.insert(0, str(Path(__file__).parent))
+_TOOLS_DIR = str(Path(__file__).parent)
+if _TOOLS_DIR not in sys.path:
+    sys.path.insert(0, _TOOLS_DIR)
 
 from shared.yaml_loader import ProfileLoader
 from shared.key_layout import TOTAL_KEYS
@@ -32,11 +34,92 @@ from shared.validators import (
     require_valid_key_label,
 )
 
+# Profiles (main + layers) generated concurrently; each writes its own folder
+GENERATE_WORKERS = 4
+
+# Valid key numbers on the device (keys dicts are sparse, so intersect rather than scan)
+_KEY_NUMBERS = frozenset(range(1, TOTAL_KEYS + 1))
+
+# Modifier keys that need KEYDOWN/KEYUP
+_MODIFIER_KEYS = frozenset({
+    'SHIFT', 'CTRL', 'ALT', 'COMMAND', 'WINDOWS', 'OPTION',
+    'RSHIFT', 'RCTRL', 'RALT', 'RCOMMAND', 'RWINDOWS', 'ROPTION',
+})
+
+# Special keys that are valid duckyScript commands (single press, no release needed)
+_SPECIAL_KEYS = frozenset({
+    'ESC', 'ESCAPE', 'ENTER', 'RETURN', 'TAB', 'SPACE', 'BACKSPACE', 'DELETE',
+    'INSERT', 'HOME', 'END', 'PAGEUP', 'PAGEDOWN', 'PAUSE', 'BREAK',
+    'UP', 'DOWN', 'LEFT', 'RIGHT', 'UPARROW', 'DOWNARROW', 'LEFTARROW', 'RIGHTARROW',
+    'CAPSLOCK', 'NUMLOCK', 'SCROLLLOCK', 'PRINTSCREEN', 'MENU', 'APP', 'POWER',
+    'F1', 'F2', 'F3', 'F4', 'F5', 'F6', 'F7', 'F8', 'F9', 'F10', 'F11', 'F12',
+    'F13', 'F14', 'F15', 'F16', 'F17', 'F18', 'F19', 'F20', 'F21', 'F22', 'F23', 'F24',
+    # Numpad keys
+    'KP_SLASH', 'KP_ASTERISK', 'KP_MINUS', 'KP_PLUS', 'KP_ENTER', 'KP_DOT', 'KP_EQUAL',
+    'KP_0', 'KP_1', 'KP_2', 'KP_3', 'KP_4', 'KP_5', 'KP_6', 'KP_7', 'KP_8', 'KP_9',
+})
+
+# Line ending for generated files: the platform's, as a text-mode write gives
+# (CRLF on Windows). _write_text translates newlines itself, because O_BINARY
+# turns off the C runtime's translation
+_NEWLINE = os.linesep
+
+# Flags for writing and reading back generated files
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+_READ_FLAGS = os.O_RDONLY | getattr(os, 'O_BINARY', 0)
+
+# Key definition fields that give a key its own action
+_ACTION_FIELDS = ('key', 'action', 'layer_type')
+
+# Windows/Linux/macOS invalid filename chars: < > : " / \ | ? *
+_INVALID_FS_CHARS = '<>:"/\\|?*'
+_INVALID_TRANS = str.maketrans('', '', _INVALID_FS_CHARS)
+
+# Layer types whose keys act on release too
+_RELEASE_LAYER_TYPES = frozenset({'modifier_hold', 'momentary'})
+
+
+@functools.lru_cache(maxsize=128)
+def _needs_release(layer_type: Optional[str], key: str, key_type: str, has_modifier_combo: bool) -> bool:
+    """
+    Decide whether a key needs a keyN-release.txt script.
+    
+    Release scripts needed for: layer switchers, single characters (alone), modifier keys (alone)
+    NOT needed for: modifier+key combos, special keys (ESC, F1, etc.), type: string
+    
+    Args:
+        layer_type: Key's layer_type (None for ordinary keys)
+        key: Key value as a string ('' if none)
+        key_type: Lower-cased key type (e.g. 'string')
+        has_modifier_combo: True if the key has a modifier (key combo like CTRL+A)
+        
+    Returns:
+        True if a release script should be written
+    """
+    if layer_type in _RELEASE_LAYER_TYPES:
+        return True
+    if has_modifier_combo or key_type == 'string':
+        return False
+    return len(key) == 1 or key.upper() in _MODIFIER_KEYS
+
 
 class YAMLToProfileConverter:
     """Convert YAML profile definitions to duckyScript profiles."""
     
-    def __init__(self, yaml_path: Path, output_dir: Optional[Path] = None, verbose: bool = False):
+    __slots__ = (
+        'yaml_path', 'output_dir', 'verbose', 'write_readme', 'loader', '_profiles_root',
+        '_profile_name', '_config', '_parent_keys', '_layers', '_layer_names',
+        '_oneshot_layer_ids',
+    )
+    
+    def __init__(
+        self,
+        yaml_path: Path,
+        output_dir: Optional[Path] = None,
+        verbose: bool = False,
+        preloaded_bytes: Optional[bytes] = None,
+        write_readme: bool = True
+    ):
         """
         Initialize converter.
         
@@ -44,14 +127,24 @@ class YAMLToProfileConverter:
             yaml_path: Path to YAML template file
             output_dir: Output directory (default: workbench/profiles/<profile-name>)
             verbose: Enable verbose output
+            preloaded_bytes: Contents of yaml_path if already read (skips reopening it)
+            write_readme: Generate a README.md in each profile folder (never deployed)
         """
         self.yaml_path = yaml_path
         self.output_dir = output_dir
         self.verbose = verbose
-        self.loader = ProfileLoader(yaml_path)
-        self.current_profile_type = 'main'  # Track if generating 'main' or 'layer'
-        self.current_layer_id = None  # Track which layer we're generating
-        
+        self.write_readme = write_readme
+        self.loader = ProfileLoader(yaml_path, preloaded_bytes=preloaded_bytes)
+        self._profiles_root = Path(__file__).parent.parent / "workbench" / "profiles"
+        
+        # Loader results, fetched once per conversion (get_keys() expands templates)
+        self._profile_name = None
+        self._config = None
+        self._parent_keys = None
+        self._layers = None
+        self._layer_names = {}  # Layer ID -> layer profile name
+        self._oneshot_layer_ids = frozenset()  # Layers entered via a oneshot key on the parent
+    
     def convert(self) -> List[Path]:
         """
         Convert YAML to duckyScript profile(s).
@@ -59,12 +152,36 @@ class YAMLToProfileConverter:
         Returns:
             List of created profile directory paths
         """
+        return list(self.iter_profiles())
+    
+    def iter_profiles(self) -> Iterator[Path]:
+        """
+        Convert YAML to duckyScript profile(s), yielding each one once written.
+        
+        Lets callers start on a profile (e.g. compile it) while the rest are
+        still being generated.
+        
+        Yields:
+            Created profile directory paths (main profile first, then layers)
+        """
         # Load YAML
         if self.verbose:
             print(f"Loading YAML: {self.yaml_path}")
         
         self.loader.load()
-        profile_name = self.loader.get_profile_name()
+        self._profile_name = profile_name = self.loader.get_profile_name()
+        self._config = self.loader.get_config()
+        self._parent_keys = self.loader.get_keys()
+        self._layers = self.loader.get_layers()
+        self._layer_names = {
+            layer_id: layer_def.get('name', f"{profile_name}-{layer_id}")
+            for layer_id, layer_def in self._layers.items()
+        }
+        self._oneshot_layer_ids = frozenset(
+            parent_key['layer']
+            for parent_key in self._parent_keys.values()
+            if parent_key.get('layer_type') == 'oneshot' and parent_key.get('layer')
+        )
         
         if self.verbose:
             print(f"Profile name: {profile_name}")
@@ -73,55 +190,106 @@ class YAMLToProfileConverter:
         if self.output_dir is None:
             # Default: workbench/profiles/<profile-name> (validated)
             validated_name = self._validate_folder_name(profile_name)
-            self.output_dir = Path(__file__).parent.parent / "workbench" / "profiles" / validated_name
-        
-        created_profiles = []
-        
-        # Generate main profile
-        self.current_profile_type = 'main'
-        self.current_layer_id = None
-        main_profile_dir = self._generate_profile(
-            profile_name,
-            self.loader.get_config(),
-            self.loader.get_keys(),
-            self.output_dir
+            self.output_dir = self._profiles_root / validated_name
+        
+        # Main profile first, then layers. Profiles write separate folders and
+        # only read the loader state above (which profile is being generated is
+        # passed down explicitly), so they are generated on a pool
+        # (sequentially in verbose mode, to keep each profile's output together)
+        layers = list(self._layers.items())
+        workers = 1 if self.verbose else min(GENERATE_WORKERS, len(layers) + 1)
+        
+        # Profiles sharing a folder (compared case-insensitively, as on FAT) must
+        # not be written concurrently; generate them in order so the last one wins
+        output_dirs = {str(self.output_dir).casefold()}
+        output_dirs.update(
+            str(self._profiles_root / self._layer_names[layer_id]).casefold()
+            for layer_id, _ in layers
         )
-        created_profiles.append(main_profile_dir)
+        if len(output_dirs) != len(layers) + 1:
+            workers = 1
         
-        # Generate layer profiles
-        layers = self.loader.get_layers()
-        for layer_id, layer_def in layers.items():
-            self.current_profile_type = 'layer'
-            self.current_layer_id = layer_id
-            
-            layer_name = layer_def.get('name', f"{profile_name}-{layer_id}")
-            layer_config = layer_def.get('config', {})
-            
-            # Merge main config with layer config
-            merged_config = {**self.loader.get_config(), **layer_config}
-            
-            layer_keys = self.loader.get_layer_keys(layer_id)
-            
-            # Validate layer name for folder
-            validated_layer_name = self._validate_folder_name(layer_name)
-            layer_output_dir = Path(__file__).parent.parent / "workbench" / "profiles" / validated_layer_name
-            
-            layer_profile_dir = self._generate_profile(
-                layer_name,
-                merged_config,
-                layer_keys,
-                layer_output_dir
+        if workers == 1:
+            yield self._generate_main_profile()
+            for layer_id, layer_def in layers:
+                yield self._generate_layer_profile(layer_id, layer_def)
+            return
+        
+        from concurrent.futures import ThreadPoolExecutor  # Pulls in logging; only needed here
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(self._generate_main_profile)]
+            futures.extend(
+                executor.submit(self._generate_layer_profile, layer_id, layer_def)
+                for layer_id, layer_def in layers
             )
-            created_profiles.append(layer_profile_dir)
+            try:
+                for future in futures:
+                    yield future.result()
+            finally:
+                # On error (or if the caller stops early) drop profiles not yet
+                # started; the with block then waits for the running ones
+                for future in futures:
+                    future.cancel()
+    
+    def _generate_main_profile(self) -> Path:
+        """
+        Generate the main profile into self.output_dir.
         
-        return created_profiles
+        Returns:
+            Path to created profile directory
+        """
+        return self._generate_profile(
+            self._profile_name,
+            self._config,
+            self._parent_keys,
+            self.output_dir,
+            profile_type='main',
+            current_layer_id=None
+        )
+    
+    def _generate_layer_profile(self, layer_id: str, layer_def: Dict[str, Any]) -> Path:
+        """
+        Generate the profile for one layer.
+        
+        Args:
+            layer_id: Layer identifier from YAML
+            layer_def: Layer definition
+            
+        Returns:
+            Path to created profile directory
+        """
+        layer_name = self._layer_names[layer_id]
+        layer_config = layer_def.get('config', {})
+        
+        # Merge main config with layer config
+        merged_config = self._config.copy()
+        merged_config.update(layer_config)
+        
+        layer_keys = self.loader.get_layer_keys(layer_id)
+        
+        # Validate layer name for folder
+        validated_layer_name = self._validate_folder_name(layer_name)
+        layer_output_dir = self._profiles_root / validated_layer_name
+        
+        return self._generate_profile(
+            layer_name,
+            merged_config,
+            layer_keys,
+            layer_output_dir,
+            profile_type='layer',
+            current_layer_id=layer_id
+        )
     
     def _generate_profile(
         self, 
         profile_name: str, 
         config: Dict[str, Any], 
         keys: Dict[int, Any],
-        output_dir: Path
+        output_dir: Path,
+        *,
+        profile_type: str,
+        current_layer_id: Optional[str]
     ) -> Path:
         """
         Generate a single profile (main or layer).
@@ -131,86 +299,107 @@ class YAMLToProfileConverter:
             config: Configuration dict
             keys: Key definitions
             output_dir: Output directory
+            profile_type: 'main' or 'layer'
+            current_layer_id: ID of the layer being generated (None for the main profile)
             
         Returns:
             Path to created profile directory
         """
-        # Create output directory
-        output_dir.mkdir(parents=True, exist_ok=True)
+        # Create output directory (usually already there when regenerating:
+        # one stat instead of a failing mkdir plus a stat)
+        if not os.path.isdir(output_dir):
+            output_dir.mkdir(parents=True, exist_ok=True)
         
         if self.verbose:
             print(f"\nGenerating profile: {profile_name}")
             print(f"Output directory: {output_dir}")
         
+        # Defined keys in slot order, shared by every per-key pass below
+        key_nums = sorted(keys.keys() & _KEY_NUMBERS)
+        
         # Generate config.txt
         config_path = output_dir / "config.txt"
-        self._write_config(config_path, config, keys)
+        self._write_config(config_path, config, keys, key_nums)
         
         if self.verbose:
             print(f"  Created: {config_path.name}")
         
+        # Check once whether this layer is reached via a oneshot key on the parent
+        is_oneshot_layer = (
+            profile_type == 'layer' and
+            current_layer_id in self._oneshot_layer_ids
+        )
+        
+        # Parent layer switchers, whose switching behavior layer keys without an action inherit
+        if profile_type == 'layer':
+            parent_switchers = {
+                key_num: parent_key
+                for key_num, parent_key in self._parent_keys.items()
+                if parent_key.get('layer_type')
+            }
+        else:
+            parent_switchers = {}
+        
+        script_context = {
+            'profile_type': profile_type,
+            'current_layer_id': current_layer_id,
+            'is_oneshot_layer': is_oneshot_layer,
+        }
+        
         # Generate keyN.txt files
         key_count = 0
-        for key_num in range(1, TOTAL_KEYS + 1):
-            if key_num in keys:
-                key_def = keys[key_num]
-                
-                # If we're on a layer and this key has no action but the parent had a layer_type,
-                # we need to preserve the layer switching behavior
-                if self.current_profile_type == 'layer':
-                    parent_keys = self.loader.get_keys()
-                    if key_num in parent_keys:
-                        parent_key = parent_keys[key_num]
-                        parent_layer_type = parent_key.get('layer_type')
-                        
-                        # If parent was a layer switcher and current key has no action
-                        if parent_layer_type and not any(k in key_def for k in ['key', 'action', 'layer_type']):
-                            # Merge parent's layer switching properties
-                            key_def = {**parent_key, **key_def}
-                
-                key_path = output_dir / f"key{key_num}.txt"
-                self._write_key_script(key_path, key_num, key_def, is_release=False)
-                key_count += 1
-                
-                # Check if we need a release script
-                # Release scripts needed for: layer switchers, single characters (alone), modifier keys (alone)
-                # NOT needed for: modifier+key combos, special keys (ESC, F1, etc.), type: string
-                layer_type = key_def.get('layer_type')
-                key_val = key_def.get('key')
-                key = str(key_val) if key_val is not None else ''  # Convert to string (YAML may parse numbers as int)
-                key_type = key_def.get('type', '').lower()
-                has_modifier_combo = key_def.get('modifier')  # Key combo like CTRL+A
-                modifier_keys = {'SHIFT', 'CTRL', 'ALT', 'COMMAND', 'WINDOWS', 'OPTION',
-                                 'RSHIFT', 'RCTRL', 'RALT', 'RCOMMAND', 'RWINDOWS', 'ROPTION'}
-                is_single_char = len(key) == 1
-                is_modifier_only = key.upper() in modifier_keys
-                is_string_type = key_type == 'string'
-                
-                needs_release = (
-                    layer_type in ['modifier_hold', 'momentary'] or
-                    (not has_modifier_combo and not is_string_type and (is_single_char or is_modifier_only))
-                )
-                if needs_release:
-                    release_path = output_dir / f"key{key_num}-release.txt"
-                    self._write_key_script(release_path, key_num, key_def, is_release=True)
-                    
-                    if self.verbose:
-                        print(f"  Created: {release_path.name}")
+        for key_num in key_nums:
+            key_def = keys[key_num]
+            
+            # If we're on a layer and this key has no action but the parent had a layer_type,
+            # we need to preserve the layer switching behavior
+            parent_key = parent_switchers.get(key_num)
+            if parent_key and not any(k in key_def for k in _ACTION_FIELDS):
+                # Merge parent's layer switching properties
+                key_def = {**parent_key, **key_def}
+            
+            key_path = output_dir / f"key{key_num}.txt"
+            self._write_key_script(key_path, key_num, key_def, is_release=False, **script_context)
+            key_count += 1
+            
+            # Check if we need a release script
+            key_val = key_def.get('key')
+            needs_release = _needs_release(
+                key_def.get('layer_type'),
+                str(key_val) if key_val is not None else '',  # Convert to string (YAML may parse numbers as int)
+                key_def.get('type', '').lower(),
+                bool(key_def.get('modifier'))  # Key combo like CTRL+A
+            )
+            if needs_release:
+                release_path = output_dir / f"key{key_num}-release.txt"
+                self._write_key_script(release_path, key_num, key_def, is_release=True, **script_context)
                 
                 if self.verbose:
-                    print(f"  Created: {key_path.name}")
+                    print(f"  Created: {release_path.name}")
+            
+            if self.verbose:
+                print(f"  Created: {key_path.name}")
         
         # Generate README.md
-        readme_path = output_dir / "README.md"
-        self._write_readme(readme_path, profile_name, config, keys)
+        if self.write_readme:
+            readme_path = output_dir / "README.md"
+            self._write_readme(readme_path, profile_name, config, keys, key_nums)
+            
+            if self.verbose:
+                print(f"  Created: {readme_path.name}")
         
         if self.verbose:
-            print(f"  Created: {readme_path.name}")
             print(f"  Total keys: {key_count}")
         
         return output_dir
     
-    def _write_config(self, path: Path, config: Dict[str, Any], keys: Dict[int, Any]):
+    def _write_config(
+        self,
+        path: Path,
+        config: Dict[str, Any],
+        keys: Dict[int, Any],
+        key_nums: Optional[List[int]] = None
+    ):
         """
         Write config.txt file.
         
@@ -218,15 +407,22 @@ class YAMLToProfileConverter:
             path: Output file path
             config: Configuration dict
             keys: Key definitions (for extracting labels/colors)
+            key_nums: Defined key numbers in slot order (computed from keys if omitted)
         """
-        lines = []
+        if key_nums is None:
+            key_nums = sorted(keys.keys() & _KEY_NUMBERS)
+        
+        # Per-key lines are collected in one pass over the keys, then emitted
+        # in the section order the firmware expects
+        label_lines = []
+        swcolor_lines = []
+        abort_lines = []
+        add_label = label_lines.append
+        add_swcolor = swcolor_lines.append
+        add_abort = abort_lines.append
+        orientation = config.get('orientation', 'portrait')
         
-        # Process each key for labels, colors, and flags FIRST
-        # (This must come before IS_LANDSCAPE for proper firmware parsing)
-        for key_num in range(1, TOTAL_KEYS + 1):
-            if key_num not in keys:
-                continue
-            
+        for key_num in key_nums:
             key_def = keys[key_num]
             
             # Key labels (z1/x1 for line 1/2)
@@ -247,7 +443,6 @@ class YAMLToProfileConverter:
             
             # Validate label against orientation limits
             if z_line or x_line:
-                orientation = config.get('orientation', 'portrait')
                 try:
                     require_valid_key_label(z_line, x_line, orientation, key_num)
                 except ValidationError as e:
@@ -258,14 +453,30 @@ class YAMLToProfileConverter:
                     )
             
             if z_line:
-                lines.append(f'z{key_num} {z_line}')
+                add_label(f'z{key_num} {z_line}')
             if x_line:
-                lines.append(f'x{key_num} {x_line}')
+                add_label(f'x{key_num} {x_line}')
             
             # Don't repeat flag (dr) - must come after label
             no_repeat = key_def.get('no_repeat', False)
             if no_repeat:
-                lines.append(f'dr {key_num}')
+                add_label(f'dr {key_num}')
+            
+            # Key colors (SWCOLOR_N) - supports color names or RGB arrays
+            color_raw = key_def.get('color')
+            if color_raw:
+                color = parse_color(color_raw)
+                if color:
+                    add_swcolor(f'SWCOLOR_{key_num} {format_rgb(color)}')
+            
+            # Allow abort flags (ab)
+            allow_abort = key_def.get('allow_abort', False)
+            if allow_abort:
+                add_abort(f'ab {key_num}')
+        
+        # Labels and flags FIRST
+        # (This must come before IS_LANDSCAPE for proper firmware parsing)
+        lines = label_lines
         
         # Background color - supports color names (e.g., "red") or RGB arrays [255, 0, 0]
         bg_color_raw = config.get('background_color', config.get('bg_color'))
@@ -275,21 +486,10 @@ class YAMLToProfileConverter:
                 lines.append(f'BG_COLOR {format_rgb(bg_color)}')
         
         # Orientation - MUST come after key labels
-        orientation = config.get('orientation', 'portrait')
         if orientation == 'landscape':
             lines.append('IS_LANDSCAPE 1')
         
-        # Key colors (SWCOLOR_N) - supports color names or RGB arrays
-        for key_num in range(1, TOTAL_KEYS + 1):
-            if key_num not in keys:
-                continue
-            
-            key_def = keys[key_num]
-            color_raw = key_def.get('color')
-            if color_raw:
-                color = parse_color(color_raw)
-                if color:
-                    lines.append(f'SWCOLOR_{key_num} {format_rgb(color)}')
+        lines.extend(swcolor_lines)
         
         # Dim unused keys
         dim_unused = config.get('dim_unused', config.get('dim_unused_keys'))
@@ -303,23 +503,21 @@ class YAMLToProfileConverter:
             if keydown_color:
                 lines.append(f'KEYDOWN_COLOR {format_rgb(keydown_color)}')
         
-        # Allow abort flags (ab)
-        for key_num in range(1, TOTAL_KEYS + 1):
-            if key_num not in keys:
-                continue
-            
-            key_def = keys[key_num]
-            allow_abort = key_def.get('allow_abort', False)
-            if allow_abort:
-                lines.append(f'ab {key_num}')
+        lines.extend(abort_lines)
         
-        # Write file
-        with open(path, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(lines))
-            if lines:
-                f.write('\n')
+        self._write_text(path, lines)
     
-    def _write_key_script(self, path: Path, key_num: int, key_def: Dict[str, Any], is_release: bool = False):
+    def _write_key_script(
+        self,
+        path: Path,
+        key_num: int,
+        key_def: Dict[str, Any],
+        is_release: bool = False,
+        *,
+        profile_type: str = 'main',
+        current_layer_id: Optional[str] = None,
+        is_oneshot_layer: bool = False
+    ):
         """
         Write keyN.txt or keyN-release.txt duckyScript file.
         
@@ -328,6 +526,10 @@ class YAMLToProfileConverter:
             key_num: Key number
             key_def: Key definition dict
             is_release: True if writing release script
+            profile_type: 'main' or 'layer' (profile the script belongs to)
+            current_layer_id: ID of the layer being generated (None for the main profile)
+            is_oneshot_layer: True if the current layer is entered via a oneshot key
+                (actions then return to the parent profile)
         """
         lines = []
         
@@ -342,22 +544,14 @@ class YAMLToProfileConverter:
         # Determine action type
         action = key_def.get('action')
         layer_type = key_def.get('layer_type')
-        
-        # Check if we're on a oneshot layer (need to determine parent layer type)
-        is_oneshot_layer = False
-        if self.current_profile_type == 'layer' and self.current_layer_id:
-            # Check parent keys to see if this layer is accessed via oneshot
-            parent_keys = self.loader.get_keys()
-            for parent_key_def in parent_keys.values():
-                parent_layer = parent_key_def.get('layer')
-                parent_layer_type = parent_key_def.get('layer_type')
-                if parent_layer == self.current_layer_id and parent_layer_type == 'oneshot':
-                    is_oneshot_layer = True
-                    break
+        script = key_def.get('script')
         
         if layer_type:
             # Layer switcher key
-            self._generate_layer_switcher(lines, key_def, is_release)
+            self._generate_layer_switcher(
+                lines, key_def, is_release,
+                profile_type=profile_type, current_layer_id=current_layer_id
+            )
         elif action == 'media':
             # Media command
             command = key_def.get('command', 'MUTE')
@@ -365,9 +559,8 @@ class YAMLToProfileConverter:
             # If on oneshot layer, return to parent after media action
             if is_oneshot_layer and not is_release:
                 lines.append(f'GOTO_PROFILE {self._get_parent_profile_name()}')
-        elif action == 'custom' or key_def.get('script'):
+        elif action == 'custom' or script:
             # Custom script - either explicit action: custom or just script: property
-            script = key_def.get('script', '')
             if script and not is_release:
                 # Support array of lines or single string
                 if isinstance(script, list):
@@ -386,13 +579,17 @@ class YAMLToProfileConverter:
             if is_oneshot_layer and not is_release:
                 lines.append(f'GOTO_PROFILE {self._get_parent_profile_name()}')
         
-        # Write file
-        with open(path, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(lines))
-            if lines:
-                f.write('\n')
+        self._write_text(path, lines)
     
-    def _generate_layer_switcher(self, lines: List[str], key_def: Dict[str, Any], is_release: bool = False):
+    def _generate_layer_switcher(
+        self,
+        lines: List[str],
+        key_def: Dict[str, Any],
+        is_release: bool = False,
+        *,
+        profile_type: str = 'main',
+        current_layer_id: Optional[str] = None
+    ):
         """
         Generate duckyScript for layer switching key.
         
@@ -400,21 +597,25 @@ class YAMLToProfileConverter:
             lines: List to append script lines to
             key_def: Key definition dict
             is_release: True if generating release script
+            profile_type: 'main' or 'layer' (profile the script belongs to)
+            current_layer_id: ID of the layer being generated (None for the main profile)
         """
         layer_type = key_def.get('layer_type')
         layer_id = key_def.get('layer', 'unknown')
         modifier = key_def.get('modifier')
+        if modifier:
+            modifier = modifier.upper()
         
         # Get the actual layer profile name
         layer_name = self._get_layer_profile_name(layer_id)
         parent_name = self._get_parent_profile_name()
         
         # Determine if we're on the main profile or the layer profile
-        on_layer = (self.current_profile_type == 'layer')
+        on_layer = (profile_type == 'layer')
         
         # Check if this key switches to the CURRENT layer we're generating
         # If so, it should return to parent. If not, it should go to its target layer.
-        is_current_layer = (on_layer and layer_id == self.current_layer_id)
+        is_current_layer = (on_layer and layer_id == current_layer_id)
         
         if layer_type == 'modifier_hold':
             # Modifier hold: press modifier, switch layer, release modifier on return
@@ -425,24 +626,24 @@ class YAMLToProfileConverter:
                 if is_release:
                     # Release: release modifier and return to main
                     if modifier:
-                        lines.append(f'KEYUP {modifier.upper()}')
+                        lines.append(f'KEYUP {modifier}')
                     lines.append(f'GOTO_PROFILE {parent_name}')
                 else:
                     # Press: just hold the modifier (already switched)
                     if modifier:
-                        lines.append(f'KEYDOWN {modifier.upper()}')
+                        lines.append(f'KEYDOWN {modifier}')
             else:
                 # On main profile
                 if not is_release:
                     # Press: press modifier and switch to layer
                     if modifier:
-                        lines.append(f'KEYDOWN {modifier.upper()}')
+                        lines.append(f'KEYDOWN {modifier}')
                     lines.append(f'GOTO_PROFILE {layer_name}')
                 else:
                     # Release on main profile: just release the modifier
                     # (don't switch profiles, we're already on main)
                     if modifier:
-                        lines.append(f'KEYUP {modifier.upper()}')
+                        lines.append(f'KEYUP {modifier}')
         
         elif layer_type == 'toggle':
             # Toggle: press to switch, press again to return
@@ -499,12 +700,8 @@ class YAMLToProfileConverter:
         Returns:
             Full profile name
         """
-        # Check if this layer exists in the loaded profile
-        layers = self.loader.get_layers()
-        if layer_id in layers:
-            layer = layers[layer_id]
-            return layer.get('name', f"{self.loader.get_profile_name()}-{layer_id}")
-        return layer_id
+        # Layers not defined in the loaded profile keep their ID as the name
+        return self._layer_names.get(layer_id, layer_id)
     
     def _get_parent_profile_name(self) -> str:
         """
@@ -513,7 +710,7 @@ class YAMLToProfileConverter:
         Returns:
             Parent profile name
         """
-        return self.loader.get_profile_name()
+        return self._profile_name
     
     def _generate_key_press(self, lines: List[str], key_def: Dict[str, Any], is_release: bool = False):
         """
@@ -547,37 +744,21 @@ class YAMLToProfileConverter:
             lines.append(f'{modifier.upper()} {key.lower()}')
             return
         
-        # Modifier keys that need KEYDOWN/KEYUP
-        modifier_keys = {'SHIFT', 'CTRL', 'ALT', 'COMMAND', 'WINDOWS', 'OPTION',
-                         'RSHIFT', 'RCTRL', 'RALT', 'RCOMMAND', 'RWINDOWS', 'ROPTION'}
-        
-        # Special keys that are valid duckyScript commands (single press, no release needed)
-        special_keys = {
-            'ESC', 'ESCAPE', 'ENTER', 'RETURN', 'TAB', 'SPACE', 'BACKSPACE', 'DELETE',
-            'INSERT', 'HOME', 'END', 'PAGEUP', 'PAGEDOWN', 'PAUSE', 'BREAK',
-            'UP', 'DOWN', 'LEFT', 'RIGHT', 'UPARROW', 'DOWNARROW', 'LEFTARROW', 'RIGHTARROW',
-            'CAPSLOCK', 'NUMLOCK', 'SCROLLLOCK', 'PRINTSCREEN', 'MENU', 'APP', 'POWER',
-            'F1', 'F2', 'F3', 'F4', 'F5', 'F6', 'F7', 'F8', 'F9', 'F10', 'F11', 'F12',
-            'F13', 'F14', 'F15', 'F16', 'F17', 'F18', 'F19', 'F20', 'F21', 'F22', 'F23', 'F24',
-            # Numpad keys
-            'KP_SLASH', 'KP_ASTERISK', 'KP_MINUS', 'KP_PLUS', 'KP_ENTER', 'KP_DOT', 'KP_EQUAL',
-            'KP_0', 'KP_1', 'KP_2', 'KP_3', 'KP_4', 'KP_5', 'KP_6', 'KP_7', 'KP_8', 'KP_9',
-        }
-        
+        key_upper = key.upper()
         is_single_char = len(key) == 1
-        is_modifier = key.upper() in modifier_keys
-        is_special = key.upper() in special_keys
+        is_modifier = key_upper in _MODIFIER_KEYS
+        is_special = key_upper in _SPECIAL_KEYS
         
         if is_single_char or is_modifier:
             # Single characters (letters, digits, symbols) and modifiers need KEYDOWN/KEYUP
             if is_release:
-                lines.append(f'KEYUP {key.upper() if is_modifier else key}')
+                lines.append(f'KEYUP {key_upper if is_modifier else key}')
             else:
-                lines.append(f'KEYDOWN {key.upper() if is_modifier else key}')
+                lines.append(f'KEYDOWN {key_upper if is_modifier else key}')
         elif is_special:
             # Special keys are valid duckyScript commands - single press
             if not is_release:
-                lines.append(key.upper())
+                lines.append(key_upper)
             # No release script needed for special keys
         else:
             # Multi-character strings - type as string
@@ -585,7 +766,14 @@ class YAMLToProfileConverter:
                 lines.append(f'STRING {key}')
             # No release script needed for STRING
     
-    def _write_readme(self, path: Path, profile_name: str, config: Dict[str, Any], keys: Dict[int, Any]):
+    def _write_readme(
+        self,
+        path: Path,
+        profile_name: str,
+        config: Dict[str, Any],
+        keys: Dict[int, Any],
+        key_nums: Optional[List[int]] = None
+    ):
         """
         Write README.md for profile.
         
@@ -594,7 +782,11 @@ class YAMLToProfileConverter:
             profile_name: Profile name
             config: Configuration dict
             keys: Key definitions
+            key_nums: Defined key numbers in slot order (computed from keys if omitted)
         """
+        if key_nums is None:
+            key_nums = sorted(keys.keys() & _KEY_NUMBERS)
+        
         lines = [
             f'# {profile_name}',
             '',
@@ -622,10 +814,7 @@ class YAMLToProfileConverter:
         ])
         
         # List keys
-        for key_num in range(1, TOTAL_KEYS + 1):
-            if key_num not in keys:
-                continue
-            
+        for key_num in key_nums:
             key_def = keys[key_num]
             
             # Format label
@@ -650,12 +839,58 @@ class YAMLToProfileConverter:
             '',
             f'This profile was automatically generated from the YAML template `{self.yaml_path.name}`.',
             'To modify this profile, edit the YAML file and regenerate.',
-            '',
         ])
         
-        # Write file
-        with open(path, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(lines))
+        self._write_text(path, lines)
+    
+    @staticmethod
+    def _write_text(path: Path, lines: List[str]) -> bool:
+        """
+        Write lines to a file with a single write() call.
+        
+        Newlines are written as os.linesep (CRLF on Windows, as in text mode)
+        and the file ends with one (an empty list produces an empty file).
+        Goes straight to the file descriptor: open/write/close, without the
+        fstat, isatty and seek calls a buffered file object makes when opened.
+        
+        A file that already holds exactly this text is left untouched, so
+        regenerating an unchanged profile rewrites nothing (and keeps mtimes).
+        
+        Args:
+            path: Output file path
+            lines: Lines to write (without newlines)
+            
+        Returns:
+            True if the file was written, False if it was already up to date
+        """
+        text = '\n'.join(lines) + '\n' if lines else ''
+        if _NEWLINE != '\n':
+            # Also covers newlines inside a line (e.g. multi-line scripts)
+            text = text.replace('\n', _NEWLINE)
+        data = text.encode('utf-8')
+        
+        # Only read the old file back when its size already matches
+        try:
+            if os.stat(path).st_size == len(data):
+                fd = os.open(path, _READ_FLAGS)
+                try:
+                    existing = os.read(fd, len(data) + 1)
+                finally:
+                    os.close(fd)
+                if existing == data:
+                    return False
+        except FileNotFoundError:
+            pass
+        
+        data = memoryview(data)
+        fd = os.open(path, _WRITE_FLAGS, 0o666)
+        try:
+            # Loop in case of a short write
+            while data:
+                data = data[os.write(fd, data):]
+        finally:
+            os.close(fd)
+        return True
     
     def _format_action_description(self, key_def: Dict[str, Any]) -> str:
         """
@@ -732,12 +967,9 @@ class YAMLToProfileConverter:
                 f"Please shorten the profile name in your YAML file."
             )
         
-        # Then check filesystem characters
-        # Windows/Linux/macOS invalid chars: < > : " / \ | ? *
-        invalid_chars = '<>:"/\\|?*'
-        found_invalid = [c for c in name if c in invalid_chars]
-        
-        if found_invalid:
+        # Then check filesystem characters (translate() deletes them in a single C pass)
+        if name.translate(_INVALID_TRANS) != name:
+            found_invalid = [c for c in name if c in _INVALID_FS_CHARS]
             raise ValueError(
                 f"Profile name '{name}' contains invalid filesystem characters: {', '.join(repr(c) for c in found_invalid)}\n"
                 f"Please rename the profile in your YAML file to remove these characters."
@@ -748,6 +980,10 @@ class YAMLToProfileConverter:
 
 def main():
     """Main entry point."""
+    # CLI-only imports (not needed when execute.py imports the converter)
+    import argparse
+    import traceback
+    
     parser = argparse.ArgumentParser(
         description='Generate duckyPad Pro profile from YAML template',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -761,6 +997,9 @@ Examples:
   
   # Verbose output
   python generate.py workbench/foxhole.yaml -v
+  
+  # Skip the per-profile README.md
+  python generate.py workbench/foxhole.yaml --no-readme
         """
     )
     
@@ -782,6 +1021,12 @@ Examples:
         help='Enable verbose output'
     )
     
+    parser.add_argument(
+        '--no-readme',
+        action='store_true',
+        help='Do not generate README.md in each profile folder'
+    )
+    
     args = parser.parse_args()
     
     # Validate YAML file exists
@@ -790,7 +1035,9 @@ Examples:
         sys.exit(1)
     
     # Convert YAML to profile
-    converter = YAMLToProfileConverter(args.yaml_file, args.output, args.verbose)
+    converter = YAMLToProfileConverter(
+        args.yaml_file, args.output, args.verbose, write_readme=not args.no_readme
+    )
     
     try:
         created_profiles = converter.convert()
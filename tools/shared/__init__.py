@@ -26,11 +26,6 @@ from .key_layout import (
     get_landscape_position,
 )
 
-from .yaml_loader import (
-    ProfileLoader,
-    load_profile,
-)
-
 from .profiles import (
     ProfileInfoManager,
     KeySettings,
@@ -39,6 +34,8 @@ from .profiles import (
 )
 
 from .console import (
+    color_enabled,
+    colorize,
     print_color,
     print_success,
     print_error,
@@ -46,6 +43,7 @@ from .console import (
     print_info,
     print_verbose,
     prompt_yes_no,
+    flush_output,
 )
 
 from .validators import (
@@ -65,6 +63,13 @@ from .validators import (
     MAX_LABEL_CHARS_PER_LINE_LANDSCAPE,
 )
 
+from .fileops import (
+    clone_file,
+    copy_data,
+    copy_file,
+    file_digest,
+)
+
 from .colors import (
     parse_color,
     format_rgb,
@@ -96,6 +101,8 @@ __all__ = [
     'ProfileLoader',
     'load_profile',
     'ProfileInfoManager',
+    'color_enabled',
+    'colorize',
     'print_color',
     'print_success',
     'print_error',
@@ -103,6 +110,7 @@ __all__ = [
     'print_info',
     'print_verbose',
     'prompt_yes_no',
+    'flush_output',
     'ValidationError',
     'validate_profile_name',
     'validate_key_label',
@@ -117,9 +125,32 @@ __all__ = [
     'MAX_LABEL_CHARS_PER_LINE_PORTRAIT',
     'MAX_LABEL_CHARS_LANDSCAPE',
     'MAX_LABEL_CHARS_PER_LINE_LANDSCAPE',
+    'clone_file',
+    'copy_data',
+    'copy_file',
+    'file_digest',
     'parse_color',
     'format_rgb',
     'normalize_color_name',
     'get_available_colors',
     'COMMON_COLORS',
 ]
+
+
+# yaml_loader imports PyYAML, so its exports load on first use (PEP 562); tools
+# that only need console or validator helpers never import it
+_LAZY_EXPORTS = {
+    'ProfileLoader': 'yaml_loader',
+    'load_profile': 'yaml_loader',
+}
+
+
+def __getattr__(name):
+    """Import a lazily exported name on first access"""
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    value = getattr(import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
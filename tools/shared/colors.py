@@ -2,22 +2,24 @@
 Color utilities for duckyPad Pro profile generation.
 
 Converts color names (e.g., "red", "darkblue", "dark_blue") to RGB tuples.
-Uses the webcolors library for CSS3/HTML color name support.
+CSS3/HTML color names come from a built-in table (no third-party dependency).
 """
 
-from typing import List, Tuple, Union, Optional
+from functools import lru_cache
+from typing import Dict, List, Tuple, Union, Optional
 import re
 
-try:
-    import webcolors
-    HAS_WEBCOLORS = True
-except ImportError:
-    HAS_WEBCOLORS = False
+
+# Characters allowed in a hex color (int(s, 16) alone also takes "0x", "+", "_")
+_HEX_DIGITS = '0123456789abcdefABCDEF'
+
+# Runs of separators removed when normalizing color names
+_SEP_RE = re.compile(r'[\s_-]+')
 
 
 # Custom color aliases for common variations
 COLOR_ALIASES = {
-    # Underscore variants (webcolors uses no separators)
+    # Underscore variants (CSS3 names have no separators)
     'dark_blue': 'darkblue',
     'dark_red': 'darkred',
     'dark_green': 'darkgreen',
@@ -67,6 +69,157 @@ COLOR_ALIASES = {
     'lt_grey': 'lightgrey',
 }
 
+# The 147 CSS3 extended color keywords (same set and values as webcolors' CSS3 spec)
+_CSS3_RGB: Dict[str, Tuple[int, int, int]] = {
+    'aliceblue': (240, 248, 255),
+    'antiquewhite': (250, 235, 215),
+    'aqua': (0, 255, 255),
+    'aquamarine': (127, 255, 212),
+    'azure': (240, 255, 255),
+    'beige': (245, 245, 220),
+    'bisque': (255, 228, 196),
+    'black': (0, 0, 0),
+    'blanchedalmond': (255, 235, 205),
+    'blue': (0, 0, 255),
+    'blueviolet': (138, 43, 226),
+    'brown': (165, 42, 42),
+    'burlywood': (222, 184, 135),
+    'cadetblue': (95, 158, 160),
+    'chartreuse': (127, 255, 0),
+    'chocolate': (210, 105, 30),
+    'coral': (255, 127, 80),
+    'cornflowerblue': (100, 149, 237),
+    'cornsilk': (255, 248, 220),
+    'crimson': (220, 20, 60),
+    'cyan': (0, 255, 255),
+    'darkblue': (0, 0, 139),
+    'darkcyan': (0, 139, 139),
+    'darkgoldenrod': (184, 134, 11),
+    'darkgray': (169, 169, 169),
+    'darkgreen': (0, 100, 0),
+    'darkgrey': (169, 169, 169),
+    'darkkhaki': (189, 183, 107),
+    'darkmagenta': (139, 0, 139),
+    'darkolivegreen': (85, 107, 47),
+    'darkorange': (255, 140, 0),
+    'darkorchid': (153, 50, 204),
+    'darkred': (139, 0, 0),
+    'darksalmon': (233, 150, 122),
+    'darkseagreen': (143, 188, 143),
+    'darkslateblue': (72, 61, 139),
+    'darkslategray': (47, 79, 79),
+    'darkslategrey': (47, 79, 79),
+    'darkturquoise': (0, 206, 209),
+    'darkviolet': (148, 0, 211),
+    'deeppink': (255, 20, 147),
+    'deepskyblue': (0, 191, 255),
+    'dimgray': (105, 105, 105),
+    'dimgrey': (105, 105, 105),
+    'dodgerblue': (30, 144, 255),
+    'firebrick': (178, 34, 34),
+    'floralwhite': (255, 250, 240),
+    'forestgreen': (34, 139, 34),
+    'fuchsia': (255, 0, 255),
+    'gainsboro': (220, 220, 220),
+    'ghostwhite': (248, 248, 255),
+    'gold': (255, 215, 0),
+    'goldenrod': (218, 165, 32),
+    'gray': (128, 128, 128),
+    'green': (0, 128, 0),
+    'greenyellow': (173, 255, 47),
+    'grey': (128, 128, 128),
+    'honeydew': (240, 255, 240),
+    'hotpink': (255, 105, 180),
+    'indianred': (205, 92, 92),
+    'indigo': (75, 0, 130),
+    'ivory': (255, 255, 240),
+    'khaki': (240, 230, 140),
+    'lavender': (230, 230, 250),
+    'lavenderblush': (255, 240, 245),
+    'lawngreen': (124, 252, 0),
+    'lemonchiffon': (255, 250, 205),
+    'lightblue': (173, 216, 230),
+    'lightcoral': (240, 128, 128),
+    'lightcyan': (224, 255, 255),
+    'lightgoldenrodyellow': (250, 250, 210),
+    'lightgray': (211, 211, 211),
+    'lightgreen': (144, 238, 144),
+    'lightgrey': (211, 211, 211),
+    'lightpink': (255, 182, 193),
+    'lightsalmon': (255, 160, 122),
+    'lightseagreen': (32, 178, 170),
+    'lightskyblue': (135, 206, 250),
+    'lightslategray': (119, 136, 153),
+    'lightslategrey': (119, 136, 153),
+    'lightsteelblue': (176, 196, 222),
+    'lightyellow': (255, 255, 224),
+    'lime': (0, 255, 0),
+    'limegreen': (50, 205, 50),
+    'linen': (250, 240, 230),
+    'magenta': (255, 0, 255),
+    'maroon': (128, 0, 0),
+    'mediumaquamarine': (102, 205, 170),
+    'mediumblue': (0, 0, 205),
+    'mediumorchid': (186, 85, 211),
+    'mediumpurple': (147, 112, 219),
+    'mediumseagreen': (60, 179, 113),
+    'mediumslateblue': (123, 104, 238),
+    'mediumspringgreen': (0, 250, 154),
+    'mediumturquoise': (72, 209, 204),
+    'mediumvioletred': (199, 21, 133),
+    'midnightblue': (25, 25, 112),
+    'mintcream': (245, 255, 250),
+    'mistyrose': (255, 228, 225),
+    'moccasin': (255, 228, 181),
+    'navajowhite': (255, 222, 173),
+    'navy': (0, 0, 128),
+    'oldlace': (253, 245, 230),
+    'olive': (128, 128, 0),
+    'olivedrab': (107, 142, 35),
+    'orange': (255, 165, 0),
+    'orangered': (255, 69, 0),
+    'orchid': (218, 112, 214),
+    'palegoldenrod': (238, 232, 170),
+    'palegreen': (152, 251, 152),
+    'paleturquoise': (175, 238, 238),
+    'palevioletred': (219, 112, 147),
+    'papayawhip': (255, 239, 213),
+    'peachpuff': (255, 218, 185),
+    'peru': (205, 133, 63),
+    'pink': (255, 192, 203),
+    'plum': (221, 160, 221),
+    'powderblue': (176, 224, 230),
+    'purple': (128, 0, 128),
+    'red': (255, 0, 0),
+    'rosybrown': (188, 143, 143),
+    'royalblue': (65, 105, 225),
+    'saddlebrown': (139, 69, 19),
+    'salmon': (250, 128, 114),
+    'sandybrown': (244, 164, 96),
+    'seagreen': (46, 139, 87),
+    'seashell': (255, 245, 238),
+    'sienna': (160, 82, 45),
+    'silver': (192, 192, 192),
+    'skyblue': (135, 206, 235),
+    'slateblue': (106, 90, 205),
+    'slategray': (112, 128, 144),
+    'slategrey': (112, 128, 144),
+    'snow': (255, 250, 250),
+    'springgreen': (0, 255, 127),
+    'steelblue': (70, 130, 180),
+    'tan': (210, 180, 140),
+    'teal': (0, 128, 128),
+    'thistle': (216, 191, 216),
+    'tomato': (255, 99, 71),
+    'turquoise': (64, 224, 208),
+    'violet': (238, 130, 238),
+    'wheat': (245, 222, 179),
+    'white': (255, 255, 255),
+    'whitesmoke': (245, 245, 245),
+    'yellow': (255, 255, 0),
+    'yellowgreen': (154, 205, 50),
+}
+
 
 def normalize_color_name(name: str) -> str:
     """
@@ -80,7 +233,7 @@ def normalize_color_name(name: str) -> str:
         name: Color name to normalize
         
     Returns:
-        Normalized color name suitable for webcolors lookup
+        Normalized color name suitable for CSS3 name lookup
     """
     # First check if it's an alias (before normalization)
     lower_name = name.lower().strip()
@@ -88,7 +241,7 @@ def normalize_color_name(name: str) -> str:
         return COLOR_ALIASES[lower_name]
     
     # Remove separators and normalize
-    normalized = re.sub(r'[\s_-]+', '', lower_name)
+    normalized = _SEP_RE.sub('', lower_name)
     return normalized
 
 
@@ -125,46 +278,48 @@ def parse_color(color_value: Union[str, List[int], Tuple[int, ...]]) -> Optional
                 raise ValueError(f"RGB {val} value must be integer 0-255, got: {v}")
         return (int(r), int(g), int(b))
     
-    # String value - could be color name or hex
+    # String value - could be color name or hex (memoized: profiles repeat names)
     if isinstance(color_value, str):
-        color_str = color_value.strip()
-        
-        # Try hex format first
-        if color_str.startswith('#') or re.match(r'^[0-9a-fA-F]{6}$', color_str):
-            hex_str = color_str.lstrip('#')
-            if len(hex_str) != 6:
-                raise ValueError(f"Invalid hex color format: {color_value}")
-            try:
-                r = int(hex_str[0:2], 16)
-                g = int(hex_str[2:4], 16)
-                b = int(hex_str[4:6], 16)
-                return (r, g, b)
-            except ValueError:
-                raise ValueError(f"Invalid hex color: {color_value}")
+        return _parse_color_str(color_value)
+    
+    raise ValueError(f"Invalid color format: {color_value} (type: {type(color_value).__name__})")
+
+
+@lru_cache(maxsize=1024)
+def _parse_color_str(color_value: str) -> Tuple[int, int, int]:
+    """
+    Parse a color name or hex string into an RGB tuple (see parse_color).
+    
+    Args:
+        color_value: Color string from YAML
         
-        # Try as color name
-        if not HAS_WEBCOLORS:
-            raise ValueError(
-                f"Color name '{color_value}' requires the webcolors library. "
-                "Install it with: pip install webcolors"
-            )
+    Returns:
+        Tuple of (r, g, b) integers (0-255)
         
-        normalized = normalize_color_name(color_str)
-        try:
-            # webcolors.name_to_hex returns '#rrggbb'
-            hex_value = webcolors.name_to_hex(normalized)
-            r = int(hex_value[1:3], 16)
-            g = int(hex_value[3:5], 16)
-            b = int(hex_value[5:7], 16)
-            return (r, g, b)
-        except (ValueError, AttributeError):
-            raise ValueError(
-                f"Unknown color name: '{color_value}'. "
-                "Use CSS3 color names (e.g., 'red', 'darkblue', 'coral') "
-                "or RGB values [r, g, b]."
-            )
+    Raises:
+        ValueError: If the color format is invalid or color name not found
+    """
+    color_str = color_value.strip()
     
-    raise ValueError(f"Invalid color format: {color_value} (type: {type(color_value).__name__})")
+    # Try hex format first (one int() conversion, channels unpacked by shifting)
+    hex_str = color_str.lstrip('#')
+    if len(hex_str) == 6 and not hex_str.strip(_HEX_DIGITS):
+        v = int(hex_str, 16)
+        return (v >> 16, (v >> 8) & 0xFF, v & 0xFF)
+    if color_str.startswith('#'):
+        if len(hex_str) != 6:
+            raise ValueError(f"Invalid hex color format: {color_value}")
+        raise ValueError(f"Invalid hex color: {color_value}")
+    
+    # Try as color name
+    rgb = _CSS3_RGB.get(normalize_color_name(color_str))
+    if rgb is None:
+        raise ValueError(
+            f"Unknown color name: '{color_value}'. "
+            "Use CSS3 color names (e.g., 'red', 'darkblue', 'coral') "
+            "or RGB values [r, g, b]."
+        )
+    return rgb
 
 
 def format_rgb(color: Tuple[int, int, int]) -> str:
@@ -187,13 +342,7 @@ def get_available_colors() -> List[str]:
     Returns:
         List of color names that can be used
     """
-    if not HAS_WEBCOLORS:
-        return []
-    
-    # Get CSS3 color names
-    colors = list(webcolors.CSS3_NAMES_TO_HEX.keys())
-    colors.sort()
-    return colors
+    return sorted(_CSS3_RGB)
 
 
 # Common colors for quick reference
@@ -4,6 +4,8 @@ Console Utilities
 Shared functions for colored terminal output and user interaction
 """
 
+import os
+import sys
 from typing import Optional
 
 
@@ -12,22 +14,69 @@ COLORS = {
     "green": "\033[92m",
     "red": "\033[91m",
     "yellow": "\033[93m",
+    "blue": "\033[94m",
     "cyan": "\033[96m",
     "white": "\033[97m",
     "gray": "\033[90m",
     "reset": "\033[0m"
 }
 
+_DEFAULT_COLOR = COLORS["white"]
+_RESET = COLORS["reset"]
+
+# Escape codes are only written to a color-capable terminal; piped or redirected
+# output, NO_COLOR (https://no-color.org) and TERM=dumb get plain text
+_USE_COLOR = (
+    sys.stdout is not None
+    and sys.stdout.isatty()
+    and not os.environ.get("NO_COLOR")
+    and os.environ.get("TERM") != "dumb"
+)
+
+
+def color_enabled() -> bool:
+    """Check whether console output is colored
+    
+    Returns:
+        True if escape codes are written, False for plain text
+    """
+    return _USE_COLOR
+
+
+def colorize(message: str, color: str = "white") -> str:
+    """Wrap text in color escape codes (unchanged when color output is off)
+    
+    Args:
+        message: Text to color
+        color: Color name (green, red, yellow, blue, cyan, white, gray)
+        
+    Returns:
+        Text ready to write to stdout
+    """
+    if _USE_COLOR:
+        return f"{COLORS.get(color, _DEFAULT_COLOR)}{message}{_RESET}"
+    return message
+
 
 def print_color(message: str, color: str = "white") -> None:
     """Print colored message to console
     
     Args:
         message: Message to print
-        color: Color name (green, red, yellow, cyan, white, gray)
+        color: Color name (green, red, yellow, blue, cyan, white, gray)
+    """
+    if _USE_COLOR:
+        sys.stdout.write(f"{COLORS.get(color, _DEFAULT_COLOR)}{message}{_RESET}\n")
+    else:
+        sys.stdout.write(f"{message}\n")
+
+
+def flush_output() -> None:
+    """Flush buffered console output
+    
+    Call at the end of a phase that prints many lines (e.g. verbose backup).
     """
-    color_code = COLORS.get(color, COLORS["white"])
-    print(f"{color_code}{message}{COLORS['reset']}")
+    sys.stdout.flush()
 
 
 def print_success(message: str) -> None:
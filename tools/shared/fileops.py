@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+File Operations
+Shared file copy helpers for deploying profiles and backing up the SD card
+
+Copies are cloned (reflinked) when the filesystem supports it: FICLONE on
+Linux (Btrfs/XFS) and clonefile() on macOS (APFS). Otherwise data is copied
+in-kernel with copy_file_range() (or sendfile()) on Linux, or through a 1 MiB
+buffer, which suits SD cards (USB mass storage) far better than shutil's
+64 KiB chunks.
+"""
+
+import hashlib
+import os
+import platform
+import shutil
+import threading
+from typing import Set, Tuple
+
+try:
+    import fcntl
+    HAS_FCNTL = True
+except ImportError:
+    HAS_FCNTL = False
+
+
+# Linux ioctl request number for cloning a whole file (_IOW(0x94, 9, int))
+FICLONE = 0x40049409
+
+SYSTEM = platform.system()
+
+# FAT (the SD card's filesystem) stores modification times in 2-second steps,
+# so an mtime read back from the card can differ from the source by this much
+FAT_MTIME_RESOLUTION_NS = 2_000_000_000
+
+# Buffer size for userspace copies (large writes avoid read-modify-write on SD cards)
+COPY_BUFFER_SIZE = 1 << 20
+
+HAS_COPY_FILE_RANGE = hasattr(os, "copy_file_range")
+
+# sendfile(2) accepts a regular file as the output only on Linux
+HAS_SENDFILE = SYSTEM == "Linux" and hasattr(os, "sendfile")
+
+# (source device, destination device) pairs where cloning already failed
+_clone_unsupported: Set[Tuple[int, int]] = set()
+_libc = None
+
+# Per-thread reusable copy buffer
+_buffers = threading.local()
+
+
+def _clone_file_linux(src: str, dst: str) -> bool:
+    """Clone a file with the FICLONE ioctl
+    
+    Args:
+        src: Source file path
+        dst: Destination file path (created or truncated)
+    
+    Returns:
+        True if the clone succeeded
+    """
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        devices = (os.fstat(fsrc.fileno()).st_dev, os.fstat(fdst.fileno()).st_dev)
+        if devices in _clone_unsupported:
+            return False
+        try:
+            fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+            return True
+        except OSError:
+            # EXDEV, EOPNOTSUPP, EINVAL, ...: don't try this device pair again
+            _clone_unsupported.add(devices)
+            return False
+
+
+def _clone_file_macos(src: str, dst: str) -> bool:
+    """Clone a file with clonefile(2)
+    
+    Args:
+        src: Source file path
+        dst: Destination file path (must not exist yet)
+    
+    Returns:
+        True if the clone succeeded
+    """
+    global _libc
+    if _libc is None:
+        import ctypes
+        import ctypes.util
+        _libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+    
+    if os.path.lexists(dst):
+        return False
+    return _libc.clonefile(os.fsencode(src), os.fsencode(dst), 0) == 0
+
+
+def clone_file(src: str, dst: str) -> bool:
+    """Try to clone a file without copying its data
+    
+    Args:
+        src: Source file path
+        dst: Destination file path
+    
+    Returns:
+        True if cloned, False if the caller should copy the data instead
+    """
+    try:
+        if SYSTEM == "Linux" and HAS_FCNTL:
+            return _clone_file_linux(src, dst)
+        if SYSTEM == "Darwin":
+            return _clone_file_macos(src, dst)
+    except OSError:
+        pass
+    return False
+
+
+def _copy_file_range(fsrc, fdst) -> bool:
+    """Copy a whole file in the kernel with copy_file_range(2)
+    
+    Args:
+        fsrc: Source file object (opened for reading)
+        fdst: Destination file object (opened for writing, empty)
+        
+    Returns:
+        True if all data was copied, False if the caller should fall back
+        (only when nothing has been written yet)
+    """
+    in_fd = fsrc.fileno()
+    out_fd = fdst.fileno()
+    copied = 0
+    while True:
+        try:
+            sent = os.copy_file_range(in_fd, out_fd, COPY_BUFFER_SIZE)
+        except OSError:
+            # EXDEV, ENOSYS, EINVAL, ...: fall back unless we are mid-copy
+            if copied:
+                raise
+            return False
+        if sent == 0:
+            # Some filesystems (and FUSE mounts) report end of file right away
+            # for files that are not empty; fall back as shutil does
+            return copied > 0 or os.fstat(in_fd).st_size == 0
+        copied += sent
+
+
+def _sendfile(fsrc, fdst) -> bool:
+    """Copy a whole file in the kernel with sendfile(2)
+    
+    Used when copy_file_range() is unavailable or refuses the file pair
+    (e.g. cross-filesystem copies on kernels before 5.3).
+    
+    Args:
+        fsrc: Source file object (opened for reading)
+        fdst: Destination file object (opened for writing, empty)
+        
+    Returns:
+        True if all data was copied, False if the caller should fall back
+        (only when nothing has been written yet)
+    """
+    in_fd = fsrc.fileno()
+    out_fd = fdst.fileno()
+    offset = 0
+    while True:
+        try:
+            sent = os.sendfile(out_fd, in_fd, offset, COPY_BUFFER_SIZE)
+        except OSError:
+            if offset:
+                raise
+            return False
+        if sent == 0:
+            return True
+        offset += sent
+
+
+def _copy_buffered(fsrc, fdst):
+    """Copy file data through a large reusable buffer
+    
+    Args:
+        fsrc: Source file object (unbuffered, opened for reading)
+        fdst: Destination file object (unbuffered, opened for writing)
+    """
+    view = getattr(_buffers, "view", None)
+    if view is None:
+        view = _buffers.view = memoryview(bytearray(COPY_BUFFER_SIZE))
+    
+    readinto = fsrc.readinto
+    write = fdst.write
+    while True:
+        n = readinto(view)
+        if not n:
+            break
+        if n == COPY_BUFFER_SIZE:
+            write(view)
+        else:
+            write(view[:n])
+
+
+def file_digest(path: str) -> bytes:
+    """Compute a BLAKE2b digest of a file's contents
+    
+    Args:
+        path: File to hash
+        
+    Returns:
+        Raw digest bytes
+    """
+    with open(path, "rb") as f:
+        if hasattr(hashlib, "file_digest"):  # Python 3.11+
+            return hashlib.file_digest(f, "blake2b").digest()
+        digest = hashlib.blake2b()
+        for chunk in iter(lambda: f.read(COPY_BUFFER_SIZE), b""):
+            digest.update(chunk)
+        return digest.digest()
+
+
+def copy_data(src: str, dst: str):
+    """Copy file contents (no metadata) using the fastest available method
+    
+    Args:
+        src: Source file path
+        dst: Destination file path (created or truncated)
+    """
+    with open(src, "rb", buffering=0) as fsrc, open(dst, "wb", buffering=0) as fdst:
+        if HAS_COPY_FILE_RANGE and _copy_file_range(fsrc, fdst):
+            return
+        if HAS_SENDFILE and _sendfile(fsrc, fdst):
+            return
+        _copy_buffered(fsrc, fdst)
+
+
+def copy_file(src, dst) -> str:
+    """Copy a file with its metadata, cloning it when possible
+    
+    Drop-in replacement for shutil.copy2 (usable as copytree's copy_function).
+    
+    Args:
+        src: Source file path
+        dst: Destination file path or directory
+    
+    Returns:
+        Destination file path
+    """
+    src = os.fspath(src)
+    dst = os.fspath(dst)
+    if os.path.isdir(dst):
+        dst = os.path.join(dst, os.path.basename(src))
+    
+    if not clone_file(src, dst):
+        copy_data(src, dst)
+    shutil.copystat(src, dst)
+    return dst
@@ -16,6 +16,11 @@ from .validators import (
 )
 
 
+# GOTO_PROFILE ProfileName (non-greedy, stops at newline or end)
+# Matches word characters, hyphens, and spaces but stops at newline
+_GOTO_RE = re.compile(r'GOTO_PROFILE\s+([A-Za-z0-9_\-][A-Za-z0-9_\-\s]*?)(?=\s*$|\s*\n)', re.MULTILINE)
+
+
 class ProfileInfoManager:
     """Manage profile name to index mapping from profile_info.txt"""
     
@@ -235,10 +240,6 @@ class ProfileInfoManager:
         """
         warnings = []
         
-        # Pattern to match GOTO_PROFILE ProfileName (non-greedy, stops at newline or end)
-        # Matches word characters, hyphens, and spaces but stops at newline
-        pattern = r'GOTO_PROFILE\s+([A-Za-z0-9_\-][A-Za-z0-9_\-\s]*?)(?=\s*$|\s*\n)'
-        
         def replace_func(match):
             profile_name = match.group(1).strip()
             
@@ -259,7 +260,7 @@ class ProfileInfoManager:
                 # Leave the name as-is; it will be resolved at deployment time
                 return match.group(0)  # Leave unchanged
         
-        transformed = re.sub(pattern, replace_func, script_content, flags=re.MULTILINE)
+        transformed = _GOTO_RE.sub(replace_func, script_content)
         
         return transformed, warnings
 
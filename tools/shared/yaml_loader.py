@@ -14,6 +14,12 @@ from typing import Dict, List, Any, Optional, Union
 
 import yaml
 
+# libyaml's C parser is much faster than the pure-Python one (same safe semantics)
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader
+
 from .validators import (
     ValidationError,
     validate_profile_name,
@@ -24,14 +30,17 @@ from .validators import (
 class ProfileLoader:
     """Load and parse YAML profile definitions."""
     
-    def __init__(self, yaml_path: Union[str, Path]):
+    def __init__(self, yaml_path: Union[str, Path], preloaded_bytes: Optional[bytes] = None):
         """
         Initialize loader with YAML file path.
         
         Args:
             yaml_path: Path to YAML profile definition file
+            preloaded_bytes: Contents of yaml_path if the caller already read it
+                (load() then parses these instead of opening the file again)
         """
         self.yaml_path = Path(yaml_path)
+        self.preloaded_bytes = preloaded_bytes
         self.data = None
         self.profile = None
         self.templates = {}
@@ -44,8 +53,11 @@ class ProfileLoader:
         Returns:
             Parsed profile data
         """
-        with open(self.yaml_path, 'r', encoding='utf-8') as f:
-            self.data = yaml.safe_load(f)
+        if self.preloaded_bytes is not None:
+            self.data = yaml.load(self.preloaded_bytes.decode('utf-8'), Loader=_SafeLoader)
+        else:
+            with open(self.yaml_path, 'r', encoding='utf-8') as f:
+                self.data = yaml.load(f, Loader=_SafeLoader)
         
         # Extract templates if present
         if 'templates' in self.data:
@@ -278,7 +290,7 @@ class ProfileLoader:
                 continue
             
             with open(template_file, 'r', encoding='utf-8') as f:
-                template_data = yaml.safe_load(f)
+                template_data = yaml.load(f, Loader=_SafeLoader)
             
             if 'template' in template_data:
                 self.template_cache[template_name] = template_data['template']
@@ -14,7 +14,9 @@ from urllib.request import Request, urlopen
 from urllib.error import URLError, HTTPError
 
 # Add shared directory to path for imports
-sys.path.insert(0, str(Path(__file__).parent))
+_TOOLS_DIR = str(Path(__file__).parent)
+if _TOOLS_DIR not in sys.path:
+    sys.path.insert(0, _TOOLS_DIR)
 from shared.console import print_color, print_verbose
 
 